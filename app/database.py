@@ -6,6 +6,7 @@ Handles database connections, queries, and CRUD operations
 for the app's SQLite database.
 """
 
+import math
 import os
 import sqlite3
 from datetime import datetime
@@ -40,12 +41,17 @@ class BettingDatabase:
         self.conn = None
         self.cursor = None
     
-    def connect(self):
+    def connect(self, check_same_thread=True):
         """
         Establish a connection to the SQLite database.
+        
+        Args:
+            check_same_thread (bool, optional): If False, the connection may be used
+                from threads other than the one that opened it. Callers must then
+                serialize access themselves.
         """
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=check_same_thread)
             # Use Row factory for dictionary-like access
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
@@ -54,6 +60,88 @@ class BettingDatabase:
             print(f"Database connection error: {e}")
             return False
     
+    def create_schema(self):
+        """Create the database schema if it doesn't exist."""
+        # Create Sports table
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sports (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            api_id TEXT,
+            active INTEGER DEFAULT 1,
+            icon_path TEXT
+        )
+        ''')
+        
+        # Create Teams table
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS teams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            sport_id INTEGER NOT NULL,
+            api_id TEXT,
+            logo_path TEXT,
+            FOREIGN KEY (sport_id) REFERENCES sports(id)
+        )
+        ''')
+        
+        # Create Bets table
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            team_id INTEGER NOT NULL,
+            odds TEXT NOT NULL,
+            description TEXT,
+            event_date TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'pending',
+            result TEXT,
+            active INTEGER DEFAULT 1,
+            commence_time TEXT,
+            sport_name TEXT,
+            FOREIGN KEY (team_id) REFERENCES teams(id)
+        )
+        ''')
+        
+        # Create Parlays table
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS parlays (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            stake REAL NOT NULL,
+            total_odds TEXT NOT NULL,
+            potential_payout REAL NOT NULL,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'pending',
+            notes TEXT
+        )
+        ''')
+        
+        # Create Parlay_Bets junction table
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS parlay_bets (
+            parlay_id INTEGER,
+            bet_id INTEGER,
+            PRIMARY KEY (parlay_id, bet_id),
+            FOREIGN KEY (parlay_id) REFERENCES parlays(id),
+            FOREIGN KEY (bet_id) REFERENCES bets(id)
+        )
+        ''')
+        
+        # Create User_Preferences table
+        self.cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            odds_format TEXT DEFAULT 'american',
+            theme TEXT DEFAULT 'light',
+            notification_enabled INTEGER DEFAULT 1,
+            api_key TEXT,
+            preferences TEXT
+        )
+        ''')
+        
+        # Commit the changes
+        self.conn.commit()
+    
     def close(self):
         """
         Close the database connection.
@@ -305,6 +393,33 @@ class BettingDatabase:
         )
         return self.fetchone()
     
+    def get_bets_by_ids(self, bet_ids):
+        """
+        Get several bets by ID in a single query.
+        
+        Args:
+            bet_ids (list): Bet IDs
+            
+        Returns:
+            list: List of bet dictionaries, in the order of bet_ids
+        """
+        if not bet_ids:
+            return []
+        
+        placeholders = ", ".join("?" for _ in bet_ids)
+        self.execute(
+            f"""
+            SELECT b.*, t.name as team_name, s.name as sport_name 
+            FROM bets b 
+            JOIN teams t ON b.team_id = t.id 
+            JOIN sports s ON t.sport_id = s.id 
+            WHERE b.id IN ({placeholders})
+            """, 
+            tuple(bet_ids)
+        )
+        rows = {row['id']: row for row in self.fetchall()}
+        return [rows[bet_id] for bet_id in bet_ids if bet_id in rows]
+    
     def get_active_bets(self, sport_id=None):
         """
         Get active bets, optionally filtered by sport.
@@ -531,3 +646,133 @@ class BettingDatabase:
         except Exception as e:
             print(f"Error updating preferences: {e}")
             return False
+
+
+def american_to_decimal(american_odds):
+    """
+    Convert American odds format to decimal.
+    
+    Args:
+        american_odds (str): Odds in American format (e.g., +120, -110). Unsigned
+            values such as 150 are read as positive odds.
+        
+    Returns:
+        float: Odds in decimal format
+    """
+    try:
+        odds_value = int(american_odds)
+        if odds_value > 0:
+            return (odds_value / 100) + 1
+        else:  # Negative odds
+            return (100 / -odds_value) + 1
+    except (ValueError, ZeroDivisionError):
+        return 1.0  # Default to even odds on error
+
+
+def decimal_to_american(decimal_odds):
+    """
+    Convert decimal odds to American format.
+    
+    Args:
+        decimal_odds (float): Odds in decimal format
+        
+    Returns:
+        str: Odds in American format
+    """
+    # Round rather than truncate, so converting back and forth keeps e.g. -110
+    if decimal_odds >= 2.0:
+        return f"+{round((decimal_odds - 1) * 100)}"
+    else:
+        return f"-{round(100 / (decimal_odds - 1))}"
+
+
+def convert_odds(odds_str, target_format='american'):
+    """
+    Convert odds between different formats.
+    
+    Args:
+        odds_str (str): The odds string to convert (American, decimal or fractional)
+        target_format (str, optional): 'american', 'decimal' or 'fractional'
+        
+    Returns:
+        str: Converted odds string
+    """
+    try:
+        # Parse the input odds
+        odds_float = 0
+        
+        # Try to determine the input format
+        if odds_str.startswith('+') or odds_str.startswith('-'):
+            # American format, already what we want to show
+            if target_format == 'american':
+                return odds_str
+            
+            american_odds = int(odds_str)
+            if american_odds > 0:
+                odds_float = american_odds / 100
+            else:
+                odds_float = 100 / abs(american_odds)
+            
+            # Add 1 to get decimal odds
+            odds_decimal = odds_float + 1
+        elif '/' in odds_str:
+            # Fractional format (e.g., "5/1")
+            num, denom = odds_str.split('/')
+            odds_float = float(num) / float(denom)
+            odds_decimal = odds_float + 1
+        else:
+            # Assume decimal format
+            odds_decimal = float(odds_str)
+        
+        # Convert to the target format
+        if target_format == 'american':
+            return decimal_to_american(odds_decimal)
+        elif target_format == 'decimal':
+            return f"{odds_decimal:.2f}"
+        elif target_format == 'fractional':
+            # Convert decimal odds to fractional (simplified)
+            decimal_minus_one = odds_decimal - 1
+            if decimal_minus_one.is_integer():
+                return f"{int(decimal_minus_one)}/1"
+            
+            # Try common fractions
+            if abs(decimal_minus_one - 0.5) < 0.01:
+                return "1/2"
+            elif abs(decimal_minus_one - 1.5) < 0.01:
+                return "3/2"
+            elif abs(decimal_minus_one - 0.33) < 0.01:
+                return "1/3"
+            else:
+                # Fallback to approximation
+                return f"{decimal_minus_one:.2f}/1"
+            
+    except Exception as e:
+        print(f"Error converting odds: {e}")
+        return odds_str
+
+
+def calculate_parlay_odds(odds_list):
+    """
+    Calculate the combined odds of a parlay.
+    
+    Args:
+        odds_list (list): Odds of each leg in American format
+        
+    Returns:
+        str: Parlay odds in American format
+    """
+    return decimal_to_american(math.prod(american_to_decimal(odds) for odds in odds_list))
+
+
+def calculate_payout(total_odds, stake):
+    """
+    Calculate the potential payout of a bet or parlay.
+    
+    Args:
+        total_odds (str): Odds in American format
+        stake (float): Stake amount
+        
+    Returns:
+        float: Potential payout, stake included
+    """
+    return stake * american_to_decimal(total_odds)
@@ -27,7 +27,7 @@ from kivy.clock import Clock
 from kivy.properties import StringProperty, ListProperty, ObjectProperty, NumericProperty
 
 # Local module imports
-from database import BettingDatabase
+from database import BettingDatabase, convert_odds
 from models import Sport, Team, Bet, Parlay, UserPreferences
 from parlay_recommendations import ParlayRecommender
 from api_service import APIService
@@ -67,8 +67,8 @@ class BettingBuddyApp(App):
         # Set app title that appears in the window title
         self.title = 'BettingBuddy'
         
-        # Load main KV file
-        Builder.load_file(os.path.join(os.path.dirname(__file__), 'bettingbuddy.kv'))
+        # bettingbuddy.kv is loaded by App.load_kv (named after this class);
+        # loading it again here would apply every rule twice
         
         # Create screen manager
         self.sm = ScreenManager(transition=SlideTransition())
@@ -114,7 +114,7 @@ class BettingBuddyApp(App):
             else:
                 # Create database structure and initialize
                 self.loading_screen.update_status("Creating database schema...")
-                self._create_database_schema()
+                self.db.create_schema()
                 
                 self.loading_screen.update_status("Initializing database with sports data...")
                 success = init_database()
@@ -148,88 +148,6 @@ class BettingBuddyApp(App):
         except Exception as e:
             self.show_error(f"Error initializing app: {str(e)}")
     
-    def _create_database_schema(self):
-        """Create the database schema if it doesn't exist."""
-        # Create Sports table
-        self.db.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sports (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            api_id TEXT,
-            active INTEGER DEFAULT 1,
-            icon_path TEXT
-        )
-        ''')
-        
-        # Create Teams table
-        self.db.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS teams (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            sport_id INTEGER NOT NULL,
-            api_id TEXT,
-            logo_path TEXT,
-            FOREIGN KEY (sport_id) REFERENCES sports(id)
-        )
-        ''')
-        
-        # Create Bets table
-        self.db.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS bets (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            team_id INTEGER NOT NULL,
-            odds TEXT NOT NULL,
-            description TEXT,
-            event_date TEXT,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'pending',
-            result TEXT,
-            active INTEGER DEFAULT 1,
-            commence_time TEXT,
-            sport_name TEXT,
-            FOREIGN KEY (team_id) REFERENCES teams(id)
-        )
-        ''')
-        
-        # Create Parlays table
-        self.db.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS parlays (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            stake REAL NOT NULL,
-            total_odds TEXT NOT NULL,
-            potential_payout REAL NOT NULL,
-            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-            status TEXT DEFAULT 'pending',
-            notes TEXT
-        )
-        ''')
-        
-        # Create Parlay_Bets junction table
-        self.db.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS parlay_bets (
-            parlay_id INTEGER,
-            bet_id INTEGER,
-            PRIMARY KEY (parlay_id, bet_id),
-            FOREIGN KEY (parlay_id) REFERENCES parlays(id),
-            FOREIGN KEY (bet_id) REFERENCES bets(id)
-        )
-        ''')
-        
-        # Create User_Preferences table
-        self.db.cursor.execute('''
-        CREATE TABLE IF NOT EXISTS user_preferences (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            odds_format TEXT DEFAULT 'american',
-            theme TEXT DEFAULT 'light',
-            notification_enabled INTEGER DEFAULT 1,
-            api_key TEXT,
-            preferences TEXT
-        )
-        ''')
-        
-        # Commit the changes
-        self.db.conn.commit()
-    
     def _load_user_preferences(self):
         """Load user preferences from the database."""
         try:
@@ -289,58 +207,7 @@ class BettingBuddyApp(App):
         if target_format is None:
             target_format = self.odds_format
         
-        try:
-            # Parse the input odds
-            odds_float = 0
-            
-            # Try to determine the input format
-            if odds_str.startswith('+') or odds_str.startswith('-'):
-                # American format
-                american_odds = int(odds_str)
-                if american_odds > 0:
-                    odds_float = american_odds / 100
-                else:
-                    odds_float = 100 / abs(american_odds)
-                
-                # Add 1 to get decimal odds
-                odds_decimal = odds_float + 1
-            elif '/' in odds_str:
-                # Fractional format (e.g., "5/1")
-                num, denom = odds_str.split('/')
-                odds_float = float(num) / float(denom)
-                odds_decimal = odds_float + 1
-            else:
-                # Assume decimal format
-                odds_decimal = float(odds_str)
-            
-            # Convert to the target format
-            if target_format == 'american':
-                if odds_decimal >= 2.0:
-                    return f"+{int((odds_decimal - 1) * 100)}"
-                else:
-                    return f"-{int(100 / (odds_decimal - 1))}"
-            elif target_format == 'decimal':
-                return f"{odds_decimal:.2f}"
-            elif target_format == 'fractional':
-                # Convert decimal odds to fractional (simplified)
-                decimal_minus_one = odds_decimal - 1
-                if decimal_minus_one.is_integer():
-                    return f"{int(decimal_minus_one)}/1"
-                
-                # Try common fractions
-                if abs(decimal_minus_one - 0.5) < 0.01:
-                    return "1/2"
-                elif abs(decimal_minus_one - 1.5) < 0.01:
-                    return "3/2"
-                elif abs(decimal_minus_one - 0.33) < 0.01:
-                    return "1/3"
-                else:
-                    # Fallback to approximation
-                    return f"{decimal_minus_one:.2f}/1"
-                
-        except Exception as e:
-            print(f"Error converting odds: {e}")
-            return odds_str
+        return convert_odds(odds_str, target_format)
     
     def on_stop(self):
         """Clean up resources when the app is closed."""
@@ -9,6 +9,8 @@ import math
 import itertools
 from datetime import datetime, timedelta
 
+from database import american_to_decimal, decimal_to_american
+
 class ParlayRecommender:
     """
     Analyzes bets and provides parlay recommendations based on various strategies.
@@ -54,15 +56,7 @@ class ParlayRecommender:
         Returns:
             float: Odds in decimal format
         """
-        try:
-            if american_odds.startswith('+'):
-                odds_value = int(american_odds[1:])
-                return (odds_value / 100) + 1
-            else:  # Negative odds
-                odds_value = int(american_odds[1:])
-                return (100 / odds_value) + 1
-        except (ValueError, ZeroDivisionError):
-            return 1.0  # Default to even odds on error
+        return american_to_decimal(american_odds)
     
     def calculate_win_probability(self, american_odds):
         """
@@ -94,10 +88,7 @@ class ParlayRecommender:
         Returns:
             str: Odds in American format
         """
-        if decimal_odds >= 2.0:
-            return f"+{int((decimal_odds - 1) * 100)}"
-        else:
-            return f"-{int(100 / (decimal_odds - 1))}"
+        return decimal_to_american(decimal_odds)
     
     def get_single_bet_recommendations(self, bets):
         """
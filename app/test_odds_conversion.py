@@ -0,0 +1,62 @@
+"""
+Test script for the shared odds converters
+"""
+from database import american_to_decimal, decimal_to_american, convert_odds
+from parlay_recommendations import ParlayRecommender
+
+def test_american_to_decimal():
+    cases = [
+        ('+150', 2.5),
+        ('150', 2.5),  # Unsigned odds are positive
+        ('-200', 1.5),
+        ('+100', 2.0),
+        ('-100', 2.0),
+        ('abc', 1.0),  # Unparseable odds fall back to 1.0
+        ('-0', 1.0),
+    ]
+
+    for odds, expected in cases:
+        result = american_to_decimal(odds)
+        print(f'{odds} -> {result}')
+        assert abs(result - expected) < 1e-9, (odds, result, expected)
+
+def test_american_round_trip():
+    # Every American line should survive a trip through decimal odds
+    for value in range(100, 2001):
+        for odds in (f'+{value}', f'-{value}'):
+            result = decimal_to_american(american_to_decimal(odds))
+            if odds == '-100':
+                # Even money is written as +100
+                assert result == '+100', result
+            else:
+                assert result == odds, (odds, result)
+
+    print('American odds round-trip: OK')
+
+def test_recommender_uses_shared_converters():
+    recommender = ParlayRecommender()
+
+    for odds in ('+150', '150', '-110', '+105'):
+        assert recommender.american_to_decimal(odds) == american_to_decimal(odds)
+
+    for decimal_odds in (1.5, 1.909, 2.05, 3.75):
+        assert recommender.decimal_to_american(decimal_odds) == decimal_to_american(decimal_odds)
+
+    print('ParlayRecommender converters match database: OK')
+
+def test_convert_odds_round_trip():
+    for odds in ('-110', '+105'):
+        # Cards show American odds as stored when the app format is American
+        assert convert_odds(odds, 'american') == odds
+
+        decimal_text = convert_odds(odds, 'decimal')
+        result = convert_odds(decimal_text, 'american')
+        print(f'{odds} -> {decimal_text} -> {result}')
+        assert result == odds, (odds, decimal_text, result)
+
+if __name__ == "__main__":
+    print("\n=== TESTING ODDS CONVERSION ===\n")
+    test_american_to_decimal()
+    test_american_round_trip()
+    test_recommender_uses_shared_converters()
+    test_convert_odds_round_trip()
@@ -0,0 +1,195 @@
+"""
+Test script for value betting analysis and value parlays
+"""
+import os
+import random
+import tempfile
+
+from database import (BettingDatabase, american_to_decimal, calculate_parlay_odds,
+                      calculate_payout, decimal_to_american)
+from models import Bet
+from value_betting import KELLY_CAP, ValueBettingAnalyzer, ValueBettingStrategy
+
+def create_test_database(db_path):
+    """Create the app's schema and fill in a few bets"""
+    db = BettingDatabase(db_path)
+    db.connect()
+
+    db.create_schema()
+
+    # One value bet per sport so the parlay suggestion can combine them
+    test_bets = [
+        ('NBA', 'Lakers', '+150', 0.65),
+        ('NFL', 'Chiefs', '+120', 0.62),
+        ('MLB', 'Yankees', '+200', 0.60),
+    ]
+
+    available_bets = []
+    for sport, team, odds, true_probability in test_bets:
+        sport_id = db.create_sport(sport)
+        team_id = db.create_team(team, sport_id)
+        bet_id = db.create_bet(team_id, odds, sport_name=sport)
+        available_bets.append({
+            'team_name': team,
+            'odds': odds,
+            'true_probability': true_probability,
+            'sport': sport,
+            'bet_id': bet_id
+        })
+
+    return db, available_bets
+
+def test_parlay_from_betting_plan():
+    db_path = os.path.join(tempfile.mkdtemp(), 'value_betting_test.db')
+    db, available_bets = create_test_database(db_path)
+
+    try:
+        strategy = ValueBettingStrategy()
+        plan = strategy.generate_betting_plan(1000.0, available_bets)
+
+        # Plan entries keep the database IDs of the bets they were built from
+        expected_ids = {bet['bet_id'] for bet in available_bets}
+        plan_ids = {bet['bet_id'] for bet in plan['value_bets']}
+        print(f'Plan bet IDs: {sorted(plan_ids)}')
+        assert plan_ids == expected_ids
+
+        parlay_suggestion = plan['parlay_suggestion']
+        assert parlay_suggestion is not None
+
+        # Build the parlay the way the value betting screen does
+        bet_ids = [bet['bet_id'] for bet in parlay_suggestion['bets']]
+        bets = [Bet.from_dict(row) for row in db.get_bets_by_ids(bet_ids)]
+        assert [bet.id for bet in bets] == bet_ids
+
+        stake = 10.0
+        total_odds = calculate_parlay_odds([bet.odds for bet in bets])
+        potential_payout = calculate_payout(total_odds, stake)
+        parlay_id = db.create_parlay(bet_ids, stake, total_odds, potential_payout, "Value Parlay")
+        assert parlay_id is not None
+
+        parlay = db.get_parlay_by_id(parlay_id)
+        print(f"Parlay {parlay_id}: {len(parlay['bets'])} legs, odds {parlay['total_odds']}, "
+              f"payout ${parlay['potential_payout']:.2f}")
+        assert sorted(bet['id'] for bet in parlay['bets']) == sorted(bet_ids)
+    finally:
+        db.close()
+        os.remove(db_path)
+
+def test_kelly_criterion():
+    analyzer = ValueBettingAnalyzer()
+
+    # Negative edge: no stake rather than a negative one
+    assert analyzer.kelly_criterion('+100', 0.3) == 0.0
+
+    # Large edge: capped at KELLY_CAP (full Kelly here would be 0.8)
+    assert analyzer.kelly_criterion('+100', 0.9) == KELLY_CAP
+
+    # In between: the plain Kelly formula, scaled by the fraction
+    expected = 0.5 - 0.5 / 1.5
+    assert abs(analyzer.kelly_criterion('+150', 0.5) - expected) < 1e-9
+    assert abs(analyzer.kelly_criterion('+150', 0.5, fraction=0.5) - expected / 2) < 1e-9
+    print(f"Kelly +150 @ 50%: {analyzer.kelly_criterion('+150', 0.5):.4f}")
+
+def test_kelly_criterion_batch():
+    analyzer = ValueBettingAnalyzer()
+
+    odds_list = ['+100', '+100', '+150', '-110', '+250', '-300']
+    probabilities = [0.3, 0.9, 0.5, 0.55, 0.35, 0.8]
+
+    for fraction in (1.0, 0.5):
+        batch = analyzer.kelly_criterion_batch(odds_list, probabilities, fraction)
+        single = [analyzer.kelly_criterion(odds, p, fraction)
+                  for odds, p in zip(odds_list, probabilities)]
+        print(f'Kelly batch (fraction {fraction}): {[round(k, 4) for k in batch]}')
+        assert batch == single
+
+def reference_value_bets(bets_data, confidence_threshold, min_edge, max_bets):
+    """Straightforward analyze, sort, filter and slice, as find_best_value_bets used to work"""
+    analyzed_bets = []
+    for bet in bets_data:
+        decimal_odds = american_to_decimal(bet['odds'])
+        true_probability = bet['true_probability']
+        edge = true_probability - 1 / decimal_odds
+        analyzed_bets.append({
+            'is_value_bet': edge >= min_edge and true_probability >= confidence_threshold,
+            'ev': ((decimal_odds * true_probability) - 1) * 100,
+            'edge': edge * 100,
+            'fair_odds': decimal_to_american(1 / true_probability if true_probability > 0 else 100),
+            'confidence': true_probability * (1 + edge),
+            'team_name': bet.get('team_name', 'Unknown'),
+            'odds': bet['odds'],
+            'true_probability': true_probability,
+            'sport': bet.get('sport', 'Unknown'),
+            'event_date': bet.get('event_date')
+        })
+
+    analyzed_bets.sort(key=lambda x: x['confidence'], reverse=True)
+    return [b for b in analyzed_bets if b['is_value_bet']][:max_bets]
+
+def test_find_best_value_bets_matches_reference():
+    random.seed(42)
+    sports = ['NBA', 'NFL', 'MLB', 'NHL', 'MMA']
+
+    bets = []
+    for i in range(300):
+        value = random.randint(100, 500)
+        bets.append({
+            'team_name': f'Team {i}',
+            'odds': f"{random.choice('+-')}{value}",
+            # Two decimals so some bets tie on confidence
+            'true_probability': round(random.uniform(0.3, 0.9), 2),
+            'sport': random.choice(sports),
+            'bet_id': i
+        })
+
+    analyzer = ValueBettingAnalyzer()
+    for confidence_threshold, min_edge, max_bets in [(0.6, 0.05, 5), (0.5, 0.0, 20), (0.7, 0.1, 300)]:
+        analyzer.set_params(confidence_threshold=confidence_threshold, min_edge=min_edge)
+        results = analyzer.find_best_value_bets(bets, max_bets=max_bets)
+        expected = reference_value_bets(bets, confidence_threshold, min_edge, max_bets)
+
+        print(f'Threshold {confidence_threshold}, edge {min_edge}: {len(results)} value bets')
+        assert [r.team_name for r in results] == [e['team_name'] for e in expected]
+
+        for result, reference in zip(results, expected):
+            # to_dict feeds generate_betting_plan, it must keep every old key
+            bet_dict = result.to_dict()
+            for key, value in reference.items():
+                if isinstance(value, float):
+                    assert abs(bet_dict[key] - value) < 1e-9, (key, bet_dict[key], value)
+                else:
+                    assert bet_dict[key] == value, (key, bet_dict[key], value)
+            assert bet_dict['bet_id'] == int(result.team_name.split()[1])
+
+def test_calculate_true_probability_from_record():
+    analyzer = ValueBettingAnalyzer()
+
+    # No history: the model probability is used as is
+    assert analyzer.calculate_true_probability_from_record(0, 0, 0.55) == 0.55
+
+    # 10 matches weigh 50%, 20 or more are capped at 70%
+    assert abs(analyzer.calculate_true_probability_from_record(8, 10, 0.5) - 0.65) < 1e-9
+    assert abs(analyzer.calculate_true_probability_from_record(30, 40, 0.5) - 0.675) < 1e-9
+
+    # Same answer as counting wins in the match history
+    random.seed(7)
+    for _ in range(50):
+        history = [{'result': random.choice(['win', 'loss'])} for _ in range(random.randint(1, 30))]
+        wins = sum(1 for match in history if match['result'] == 'win')
+        model_probability = random.random()
+        assert analyzer.calculate_true_probability(history, model_probability) == \
+            analyzer.calculate_true_probability_from_record(wins, len(history), model_probability)
+
+    print('True probability from record: OK')
+
+if __name__ == "__main__":
+    print("\n=== TESTING VALUE PARLAY FROM BETTING PLAN ===\n")
+    test_parlay_from_betting_plan()
+
+    print("\n=== TESTING KELLY CRITERION ===\n")
+    test_kelly_criterion()
+    test_kelly_criterion_batch()
+
+    print("\n=== TESTING VALUE BET SELECTION ===\n")
+    test_find_best_value_bets_matches_reference()
+    test_calculate_true_probability_from_record()
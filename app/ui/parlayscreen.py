@@ -20,7 +20,12 @@ from kivy.clock import Clock
 from datetime import datetime
 
 from ui.screens import HeaderBar, NavigationBar
-from ui.widgets import BetCard, ParlayCard, RecommendationCard
+from ui.widgets import BetCard, ParlayCard, RecommendationCard, StateButton
+
+# Density-independent sizes used by this module, converted once at import
+_DP2, _DP5, _DP10, _DP16, _DP30, _DP40, _DP50, _DP80, _DP100, _DP120 = map(
+    dp, (2, 5, 10, 16, 30, 40, 50, 80, 100, 120)
+)
 
 
 class ParlayScreen(Screen):
@@ -42,16 +47,16 @@ class ParlayScreen(Screen):
         self.tabs = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(40),
-            spacing=dp(2)
+            height=_DP40,
+            spacing=_DP2
         )
         
-        self.my_parlays_btn = Button(
+        self.my_parlays_btn = StateButton(
             text="My Parlays",
             on_release=lambda x: self.switch_tab("my_parlays")
         )
         
-        self.recommendations_btn = Button(
+        self.recommendations_btn = StateButton(
             text="Recommendations",
             on_release=lambda x: self.switch_tab("recommendations")
         )
@@ -70,7 +75,7 @@ class ParlayScreen(Screen):
         self.new_parlay_btn = Button(
             text="Create New Parlay",
             size_hint_y=None,
-            height=dp(50)
+            height=_DP50
         )
         self.new_parlay_btn.bind(on_release=self.create_new_parlay)
         self.my_parlays_content.add_widget(self.new_parlay_btn)
@@ -79,7 +84,7 @@ class ParlayScreen(Screen):
         self.parlays_scroll = ScrollView()
         self.parlays_list = GridLayout(
             cols=1,
-            spacing=dp(10),
+            spacing=_DP10,
             size_hint_y=None
         )
         self.parlays_list.bind(minimum_height=self.parlays_list.setter("height"))
@@ -93,15 +98,15 @@ class ParlayScreen(Screen):
         self.filter_layout = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(50),
-            padding=[dp(10), dp(5)],
-            spacing=dp(10)
+            height=_DP50,
+            padding=[_DP10, _DP5],
+            spacing=_DP10
         )
         
         self.filter_label = Label(
             text="Sport:",
             size_hint_x=None,
-            width=dp(50)
+            width=_DP50
         )
         
         self.sport_filter = Button(
@@ -113,7 +118,7 @@ class ParlayScreen(Screen):
         self.refresh_btn = Button(
             text="Refresh",
             size_hint_x=None,
-            width=dp(80)
+            width=_DP80
         )
         self.refresh_btn.bind(on_release=self.refresh_recommendations)
         
@@ -126,7 +131,7 @@ class ParlayScreen(Screen):
         self.recommendations_scroll = ScrollView()
         self.recommendations_list = GridLayout(
             cols=1,
-            spacing=dp(10),
+            spacing=_DP10,
             size_hint_y=None
         )
         self.recommendations_list.bind(minimum_height=self.recommendations_list.setter("height"))
@@ -162,13 +167,13 @@ class ParlayScreen(Screen):
         """Update content based on active tab."""
         self.content.clear_widgets()
         
-        if self.active_tab == "my_parlays":
-            self.my_parlays_btn.background_color = self.app.dark_primary_color
-            self.recommendations_btn.background_color = self.app.primary_color
+        on_my_parlays = self.active_tab == "my_parlays"
+        self.my_parlays_btn.active = on_my_parlays
+        self.recommendations_btn.active = not on_my_parlays
+        
+        if on_my_parlays:
             self.content.add_widget(self.my_parlays_content)
         else:
-            self.my_parlays_btn.background_color = self.app.primary_color
-            self.recommendations_btn.background_color = self.app.dark_primary_color
             self.content.add_widget(self.recommendations_content)
     
     def load_parlays(self):
@@ -188,7 +193,7 @@ class ParlayScreen(Screen):
             no_parlays = Label(
                 text="No parlays found. Create a new parlay to get started.",
                 size_hint_y=None,
-                height=dp(100)
+                height=_DP100
             )
             self.parlays_list.add_widget(no_parlays)
             return
@@ -228,7 +233,7 @@ class ParlayScreen(Screen):
             self.recommendations_list.add_widget(Label(
                 text="No active bets found for recommendations.\nAdd some bets first.",
                 size_hint_y=None,
-                height=dp(100)
+                height=_DP100
             ))
             return
         
@@ -249,8 +254,8 @@ class ParlayScreen(Screen):
                 self.recommendations_list.add_widget(Label(
                     text=category_title,
                     size_hint_y=None,
-                    height=dp(40),
-                    font_size=dp(16),
+                    height=_DP40,
+                    font_size=_DP16,
                     bold=True
                 ))
                 
@@ -264,7 +269,7 @@ class ParlayScreen(Screen):
             self.recommendations_list.add_widget(Label(
                 text="No recommendations available.\nTry selecting a different sport.",
                 size_hint_y=None,
-                height=dp(100)
+                height=_DP100
             ))
     
     def show_sport_popup(self, instance):
@@ -285,7 +290,7 @@ class ParlayScreen(Screen):
             btn = Button(
                 text=sport["name"],
                 size_hint_y=None,
-                height=dp(40)
+                height=_DP40
             )
             btn.bind(on_release=lambda x, s=sport: self.set_sport_filter(popup, s))
             content.add_widget(btn)
@@ -313,7 +318,7 @@ class ParlayScreen(Screen):
         loading = Label(
             text="Loading recommendations...",
             size_hint_y=None,
-            height=dp(100)
+            height=_DP100
         )
         self.recommendations_list.add_widget(loading)
         
@@ -368,28 +373,28 @@ class ParlayDetailScreen(Screen):
         # Content area
         self.content = BoxLayout(
             orientation="vertical",
-            padding=[dp(10), dp(5)]
+            padding=[_DP10, _DP5]
         )
         
         # Parlay info section
         self.info_section = BoxLayout(
             orientation="vertical",
             size_hint_y=None,
-            height=dp(120),
-            padding=[0, dp(10)]
+            height=_DP120,
+            padding=[0, _DP10]
         )
         
         # Stake input row
         self.stake_row = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(40)
+            height=_DP40
         )
         
         self.stake_label = Label(
             text="Stake ($):",
             size_hint_x=None,
-            width=dp(100)
+            width=_DP100
         )
         
         self.stake_input = TextInput(
@@ -407,13 +412,13 @@ class ParlayDetailScreen(Screen):
         self.odds_row = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(40)
+            height=_DP40
         )
         
         self.odds_label = Label(
             text="Total Odds:",
             size_hint_x=None,
-            width=dp(100)
+            width=_DP100
         )
         
         self.odds_value = Label(
@@ -429,13 +434,13 @@ class ParlayDetailScreen(Screen):
         self.payout_row = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(40)
+            height=_DP40
         )
         
         self.payout_label = Label(
             text="Payout:",
             size_hint_x=None,
-            width=dp(100)
+            width=_DP100
         )
         
         self.payout_value = Label(
@@ -455,14 +460,14 @@ class ParlayDetailScreen(Screen):
         self.bets_label = Label(
             text="Bets in This Parlay",
             size_hint_y=None,
-            height=dp(30),
+            height=_DP30,
             halign="left"
         )
         
         self.bets_scroll = ScrollView()
         self.bets_list = GridLayout(
             cols=1,
-            spacing=dp(10),
+            spacing=_DP10,
             size_hint_y=None
         )
         self.bets_list.bind(minimum_height=self.bets_list.setter("height"))
@@ -472,7 +477,7 @@ class ParlayDetailScreen(Screen):
         self.add_bet_btn = Button(
             text="Add Bet to Parlay",
             size_hint_y=None,
-            height=dp(50)
+            height=_DP50
         )
         self.add_bet_btn.bind(on_release=self.show_add_bet_popup)
         
@@ -480,14 +485,14 @@ class ParlayDetailScreen(Screen):
         self.notes_label = Label(
             text="Notes",
             size_hint_y=None,
-            height=dp(30),
+            height=_DP30,
             halign="left"
         )
         
         self.notes_input = TextInput(
             hint_text="Add notes about this parlay",
             size_hint_y=None,
-            height=dp(100),
+            height=_DP100,
             multiline=True
         )
         
@@ -495,9 +500,9 @@ class ParlayDetailScreen(Screen):
         self.button_row = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(50),
-            spacing=dp(10),
-            padding=[0, dp(10)]
+            height=_DP50,
+            spacing=_DP10,
+            padding=[0, _DP10]
         )
         
         self.save_btn = Button(
@@ -728,7 +733,7 @@ class ParlayDetailScreen(Screen):
             close_btn = Button(
                 text="Close",
                 size_hint_y=None,
-                height=dp(40)
+                height=_DP40
             )
             content.add_widget(close_btn)
             
@@ -750,7 +755,7 @@ class ParlayDetailScreen(Screen):
         for bet in available_bets:
             # Create bet card
             bet_card = BetCard(bet=bet, selectable=True)
-            bet_card.height = dp(80)
+            bet_card.height = _DP80
             bet_card.size_hint_y = None
             
             # Bind to add bet
@@ -904,13 +909,13 @@ class ParlayDetailScreen(Screen):
         message = Label(
             text="Are you sure you want to delete this parlay?",
             size_hint_y=None,
-            height=dp(50)
+            height=_DP50
         )
         
         button_row = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(50),
+            height=_DP50,
             spacing=10
         )
         
@@ -959,13 +964,13 @@ class ParlayDetailScreen(Screen):
         msg_label = Label(
             text=message,
             size_hint_y=None,
-            height=dp(50)
+            height=_DP50
         )
         
         close_btn = Button(
             text="OK",
             size_hint_y=None,
-            height=dp(50)
+            height=_DP50
         )
         
         content.add_widget(msg_label)
@@ -14,6 +14,8 @@ from kivy.uix.image import Image
 from kivy.metrics import dp
 from kivy.properties import StringProperty, ListProperty, BooleanProperty
 
+from ui.widgets import StateButton
+
 
 class LoadingScreen(Screen):
     """Loading screen displayed while app is initializing."""
@@ -70,28 +72,28 @@ class NavigationBar(BoxLayout):
         self.spacing = dp(10)
         
         # Home button
-        self.home_btn = Button(
+        self.home_btn = StateButton(
             text="Home",
             on_release=self.switch_to_home,
             size_hint_x=1
         )
         
         # Bets button
-        self.bets_btn = Button(
+        self.bets_btn = StateButton(
             text="Bets",
             on_release=self.switch_to_bets,
             size_hint_x=1
         )
         
         # Parlays button
-        self.parlays_btn = Button(
+        self.parlays_btn = StateButton(
             text="Parlays",
             on_release=self.switch_to_parlays,
             size_hint_x=1
         )
         
         # Settings button
-        self.settings_btn = Button(
+        self.settings_btn = StateButton(
             text="Settings",
             on_release=self.switch_to_settings,
             size_hint_x=1
@@ -114,13 +116,8 @@ class NavigationBar(BoxLayout):
             "settings": self.settings_btn
         }
         
-        app = self.parent.manager.parent
-        
         for name, btn in buttons.items():
-            if name == self.active_button:
-                btn.background_color = app.dark_primary_color
-            else:
-                btn.background_color = app.primary_color
+            btn.active = name == self.active_button
     
     def switch_to_home(self, instance):
         """Switch to home screen."""
@@ -21,6 +21,13 @@ import os
 import json
 
 from ui.screens import HeaderBar, NavigationBar
+from ui.widgets import StateButton
+
+# Density-independent sizes used by this module, converted once at import
+(_DP10, _DP15, _DP18, _DP20, _DP30, _DP40, _DP50, _DP80,
+ _DP100, _DP120, _DP130, _DP150, _DP200, _DP350, _DP400, _DP500) = map(
+    dp, (10, 15, 18, 20, 30, 40, 50, 80, 100, 120, 130, 150, 200, 350, 400, 500)
+)
 
 
 class SettingsScreen(Screen):
@@ -32,6 +39,10 @@ class SettingsScreen(Screen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
+        # Last preferences applied to the UI, to skip redundant reloads while
+        # the screen is shown; cleared in on_leave
+        self._loaded_prefs = None
+        
         # Main layout
         self.layout = BoxLayout(orientation="vertical")
         
@@ -42,8 +53,8 @@ class SettingsScreen(Screen):
         # Settings content
         self.content = GridLayout(
             cols=1,
-            spacing=dp(20),
-            padding=[dp(15), dp(15)],
+            spacing=_DP20,
+            padding=[_DP15, _DP15],
             size_hint_y=None
         )
         self.content.bind(minimum_height=self.content.setter("height"))
@@ -52,32 +63,32 @@ class SettingsScreen(Screen):
         self.api_section = BoxLayout(
             orientation="vertical",
             size_hint_y=None,
-            height=dp(120),
-            spacing=dp(10)
+            height=_DP120,
+            spacing=_DP10
         )
         
         self.api_header = Label(
             text="API Settings",
             size_hint_y=None,
-            height=dp(30),
-            font_size=dp(18),
-            halign="left",
-            text_size=(dp(500), dp(30))
+            height=_DP30,
+            font_size=_DP18,
+            halign="left"
         )
+        self.api_header.bind(size=self.api_header.setter("text_size"))
         
         self.api_description = Label(
             text="Enter your API key for The Odds API to get live odds data. Get a free key at https://the-odds-api.com",
             size_hint_y=None,
-            height=dp(40),
+            height=_DP40,
             halign="left",
-            text_size=(dp(500), dp(40))
+            text_size=(_DP500, _DP40)
         )
         
         self.api_input_row = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(40),
-            spacing=dp(10)
+            height=_DP40,
+            spacing=_DP10
         )
         
         self.api_input = TextInput(
@@ -104,46 +115,46 @@ class SettingsScreen(Screen):
         self.display_section = BoxLayout(
             orientation="vertical",
             size_hint_y=None,
-            height=dp(150),
-            spacing=dp(10)
+            height=_DP150,
+            spacing=_DP10
         )
         
         self.display_header = Label(
             text="Display Settings",
             size_hint_y=None,
-            height=dp(30),
-            font_size=dp(18),
-            halign="left",
-            text_size=(dp(500), dp(30))
+            height=_DP30,
+            font_size=_DP18,
+            halign="left"
         )
+        self.display_header.bind(size=self.display_header.setter("text_size"))
         
         # Odds format row
         self.odds_row = BoxLayout(
             orientation="horizontal", 
             size_hint_y=None,
-            height=dp(40)
+            height=_DP40
         )
         
         self.odds_label = Label(
             text="Odds Format:",
             size_hint_x=0.4,
             halign="left",
-            text_size=(dp(200), dp(40))
+            text_size=(_DP200, _DP40)
         )
         
-        self.odds_american_btn = Button(
+        self.odds_american_btn = StateButton(
             text="American",
             size_hint_x=0.2
         )
         self.odds_american_btn.bind(on_release=lambda x: self.set_odds_format("american"))
         
-        self.odds_decimal_btn = Button(
+        self.odds_decimal_btn = StateButton(
             text="Decimal",
             size_hint_x=0.2
         )
         self.odds_decimal_btn.bind(on_release=lambda x: self.set_odds_format("decimal"))
         
-        self.odds_fractional_btn = Button(
+        self.odds_fractional_btn = StateButton(
             text="Fractional",
             size_hint_x=0.2
         )
@@ -158,23 +169,23 @@ class SettingsScreen(Screen):
         self.theme_row = BoxLayout(
             orientation="horizontal", 
             size_hint_y=None,
-            height=dp(40)
+            height=_DP40
         )
         
         self.theme_label = Label(
             text="Theme:",
             size_hint_x=0.4,
             halign="left",
-            text_size=(dp(200), dp(40))
+            text_size=(_DP200, _DP40)
         )
         
-        self.theme_light_btn = Button(
+        self.theme_light_btn = StateButton(
             text="Light",
             size_hint_x=0.3
         )
         self.theme_light_btn.bind(on_release=lambda x: self.set_theme("light"))
         
-        self.theme_dark_btn = Button(
+        self.theme_dark_btn = StateButton(
             text="Dark",
             size_hint_x=0.3
         )
@@ -188,14 +199,14 @@ class SettingsScreen(Screen):
         self.notif_row = BoxLayout(
             orientation="horizontal", 
             size_hint_y=None,
-            height=dp(40)
+            height=_DP40
         )
         
         self.notif_label = Label(
             text="Notifications:",
             size_hint_x=0.7,
             halign="left",
-            text_size=(dp(350), dp(40))
+            text_size=(_DP350, _DP40)
         )
         
         self.notif_switch = Switch(
@@ -216,30 +227,30 @@ class SettingsScreen(Screen):
         self.data_section = BoxLayout(
             orientation="vertical",
             size_hint_y=None,
-            height=dp(130),
-            spacing=dp(10)
+            height=_DP130,
+            spacing=_DP10
         )
         
         self.data_header = Label(
             text="Data Management",
             size_hint_y=None,
-            height=dp(30),
-            font_size=dp(18),
-            halign="left",
-            text_size=(dp(500), dp(30))
+            height=_DP30,
+            font_size=_DP18,
+            halign="left"
         )
+        self.data_header.bind(size=self.data_header.setter("text_size"))
         
         self.refresh_btn = Button(
             text="Refresh Odds Data",
             size_hint_y=None,
-            height=dp(40)
+            height=_DP40
         )
         self.refresh_btn.bind(on_release=self.refresh_odds_data)
         
         self.clear_btn = Button(
             text="Clear All Data",
             size_hint_y=None,
-            height=dp(40),
+            height=_DP40,
             background_color=[0.8, 0.2, 0.2, 1]
         )
         self.clear_btn.bind(on_release=self.confirm_clear_data)
@@ -252,23 +263,23 @@ class SettingsScreen(Screen):
         self.about_section = BoxLayout(
             orientation="vertical",
             size_hint_y=None,
-            height=dp(100),
-            spacing=dp(10)
+            height=_DP100,
+            spacing=_DP10
         )
         
         self.about_header = Label(
             text="About",
             size_hint_y=None,
-            height=dp(30),
-            font_size=dp(18),
-            halign="left",
-            text_size=(dp(500), dp(30))
+            height=_DP30,
+            font_size=_DP18,
+            halign="left"
         )
+        self.about_header.bind(size=self.about_header.setter("text_size"))
         
         self.about_btn = Button(
             text="About BettingBuddy",
             size_hint_y=None,
-            height=dp(40)
+            height=_DP40
         )
         self.about_btn.bind(on_release=self.show_about)
         
@@ -301,6 +312,10 @@ class SettingsScreen(Screen):
         # Load current settings
         self.load_settings()
     
+    def on_leave(self):
+        """Forget the applied preferences so unsaved edits are reset on return."""
+        self._loaded_prefs = None
+    
     def load_settings(self):
         """Load current settings from database."""
         app = self.manager.parent
@@ -315,9 +330,15 @@ class SettingsScreen(Screen):
         if not prefs:
             return
         
+        # Nothing to do if the UI already reflects these preferences
+        if prefs == self._loaded_prefs:
+            return
+        self._loaded_prefs = dict(prefs)
+        
         # Update UI to reflect current settings
         self.api_key = prefs.get("api_key", "")
-        self.api_input.text = self.api_key
+        if self.api_input.text != self.api_key:
+            self.api_input.text = self.api_key
         
         # Set odds format buttons
         odds_format = prefs.get("odds_format", "american")
@@ -335,34 +356,14 @@ class SettingsScreen(Screen):
     
     def update_odds_format_buttons(self, format_type):
         """Update the odds format button states."""
-        app = self.manager.parent
-        
-        # Reset all buttons
-        self.odds_american_btn.background_color = app.primary_color
-        self.odds_decimal_btn.background_color = app.primary_color
-        self.odds_fractional_btn.background_color = app.primary_color
-        
-        # Highlight the active format
-        if format_type == "american":
-            self.odds_american_btn.background_color = app.dark_primary_color
-        elif format_type == "decimal":
-            self.odds_decimal_btn.background_color = app.dark_primary_color
-        elif format_type == "fractional":
-            self.odds_fractional_btn.background_color = app.dark_primary_color
+        self.odds_american_btn.active = format_type == "american"
+        self.odds_decimal_btn.active = format_type == "decimal"
+        self.odds_fractional_btn.active = format_type == "fractional"
     
     def update_theme_buttons(self, theme):
         """Update the theme button states."""
-        app = self.manager.parent
-        
-        # Reset all buttons
-        self.theme_light_btn.background_color = app.primary_color
-        self.theme_dark_btn.background_color = app.primary_color
-        
-        # Highlight the active theme
-        if theme == "light":
-            self.theme_light_btn.background_color = app.dark_primary_color
-        else:
-            self.theme_dark_btn.background_color = app.dark_primary_color
+        self.theme_light_btn.active = theme == "light"
+        self.theme_dark_btn.active = theme != "light"
     
     def save_api_key(self, instance):
         """Save API key to database."""
@@ -490,16 +491,16 @@ class SettingsScreen(Screen):
         warning = Label(
             text="WARNING: This will delete all your bets, parlays, and preferences. This action cannot be undone.",
             size_hint_y=None,
-            height=dp(80),
-            text_size=(dp(400), dp(80)),
+            height=_DP80,
+            text_size=(_DP400, _DP80),
             halign="center"
         )
         
         buttons = BoxLayout(
             orientation="horizontal",
             size_hint_y=None,
-            height=dp(50),
-            spacing=dp(10)
+            height=_DP50,
+            spacing=_DP10
         )
         
         cancel_btn = Button(text="Cancel")
@@ -580,16 +581,16 @@ class SettingsScreen(Screen):
         msg_label = Label(
             text=message,
             size_hint_y=None,
-            height=dp(50),
+            height=_DP50,
             halign="center",
             valign="middle",
-            text_size=(dp(400), dp(50))
+            text_size=(_DP400, _DP50)
         )
         
         close_btn = Button(
             text="OK",
             size_hint_y=None,
-            height=dp(50),
+            height=_DP50,
             size_hint_x=0.5,
             pos_hint={'center_x': 0.5}
         )
@@ -5,6 +5,9 @@ Styles Module for BettingBuddy app.
 Contains style constants and helper functions for UI styling.
 """
 
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
 from kivy.metrics import dp
 from kivy.utils import get_color_from_hex
 
@@ -18,6 +21,7 @@ TEXT_PRIMARY_COLOR = get_color_from_hex('#212121')  # Almost Black
 TEXT_SECONDARY_COLOR = get_color_from_hex('#757575')  # Medium Gray
 DIVIDER_COLOR = get_color_from_hex('#BDBDBD')  # Light Gray
 SUCCESS_COLOR = get_color_from_hex('#4CAF50')  # Green
+LIGHT_GREEN_COLOR = get_color_from_hex('#8BC34A')  # Light Green
 ERROR_COLOR = get_color_from_hex('#F44336')  # Red
 WARNING_COLOR = get_color_from_hex('#FFC107')  # Amber
 
@@ -37,42 +41,48 @@ BODY_FONT_SIZE = dp(14)
 CAPTION_FONT_SIZE = dp(12)
 
 
+# Color lookup tables; pending or unknown statuses use TEXT_SECONDARY_COLOR
+STATUS_COLORS = {
+    'won': SUCCESS_COLOR,
+    'lost': ERROR_COLOR,
+}
+
+# Bucket boundaries in ascending order, with one more color than boundaries
+_WIN_PROBABILITY_THRESHOLDS = (33, 50, 75)
+_WIN_PROBABILITY_COLORS = (ERROR_COLOR, WARNING_COLOR, LIGHT_GREEN_COLOR, SUCCESS_COLOR)
+
+_EXPECTED_VALUE_THRESHOLDS = (-0.1, 0, 0.2)
+_EXPECTED_VALUE_COLORS = (ERROR_COLOR, WARNING_COLOR, LIGHT_GREEN_COLOR, SUCCESS_COLOR)
+
+
 def get_status_color(status):
     """Get color for bet status."""
-    if status == 'won':
-        return SUCCESS_COLOR
-    elif status == 'lost':
-        return ERROR_COLOR
-    else:
-        return TEXT_SECONDARY_COLOR  # Pending or other
+    return STATUS_COLORS.get(status, TEXT_SECONDARY_COLOR)
 
 
 def get_win_probability_color(probability):
-    """Get color based on win probability."""
-    if probability >= 75:
-        return SUCCESS_COLOR
-    elif probability >= 50:
-        return get_color_from_hex('#8BC34A')  # Light Green
-    elif probability >= 33:
-        return WARNING_COLOR
-    else:
-        return ERROR_COLOR
+    """Get color based on win probability (thresholds are inclusive)."""
+    return _WIN_PROBABILITY_COLORS[bisect_right(_WIN_PROBABILITY_THRESHOLDS, probability)]
 
 
 def get_expected_value_color(ev):
-    """Get color based on expected value."""
-    if ev > 0.2:
-        return SUCCESS_COLOR
-    elif ev > 0:
-        return get_color_from_hex('#8BC34A')  # Light Green
-    elif ev > -0.1:
-        return WARNING_COLOR
-    else:
-        return ERROR_COLOR
+    """Get color based on expected value (thresholds are exclusive)."""
+    return _EXPECTED_VALUE_COLORS[bisect_left(_EXPECTED_VALUE_THRESHOLDS, ev)]
 
 
 def create_gradient(start_color, end_color, steps=100):
-    """Create a gradient between two colors."""
+    """
+    Create a gradient between two colors.
+    
+    Gradients are cached per color pair, so the result is an immutable
+    tuple of RGBA tuples shared between callers.
+    """
+    return _create_gradient_cached(tuple(start_color), tuple(end_color), steps)
+
+
+@lru_cache(maxsize=64)
+def _create_gradient_cached(start_color, end_color, steps):
+    """Compute a gradient for hashable color tuples."""
     r1, g1, b1, a1 = start_color
     r2, g2, b2, a2 = end_color
     
@@ -81,13 +91,7 @@ def create_gradient(start_color, end_color, steps=100):
     b_step = (b2 - b1) / steps
     a_step = (a2 - a1) / steps
     
-    gradient = []
-    
-    for i in range(steps + 1):
-        r = r1 + (r_step * i)
-        g = g1 + (g_step * i)
-        b = b1 + (b_step * i)
-        a = a1 + (a_step * i)
-        gradient.append([r, g, b, a])
-    
-    return gradient
+    return tuple(
+        (r1 + r_step * i, g1 + g_step * i, b1 + b_step * i, a1 + a_step * i)
+        for i in range(steps + 1)
+    )
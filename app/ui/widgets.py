@@ -5,6 +5,7 @@ Widgets Module for BettingBuddy app.
 Contains custom widgets used across the app.
 """
 
+from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
@@ -15,204 +16,220 @@ from kivy.properties import StringProperty, ListProperty, BooleanProperty, Objec
 from kivy.uix.behaviors import ButtonBehavior
 
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+
+
+# Density-independent sizes used by this module, converted once at import
+_DP5, _DP10, _DP12, _DP14, _DP15, _DP24, _DP30, _DP50, _DP100, _DP200 = map(
+    dp, (5, 10, 12, 14, 15, 24, 30, 50, 100, 200)
+)
+
+# Label text_size boxes shared by every recommendation team row
+_TEXT_SIZE_100x15 = (_DP100, _DP15)
+_TEXT_SIZE_200x15 = (_DP200, _DP15)
+
+# Shared RGBA colors for card labels
+_POSITIVE_COLOR = (0.2, 0.7, 0.2, 1)
+_NEGATIVE_COLOR = (0.7, 0.2, 0.2, 1)
+_SECONDARY_TEXT_COLOR = (0.5, 0.5, 0.5, 1)
+
+_STATUS_COLORS = {
+    "won": _POSITIVE_COLOR,
+    "lost": _NEGATIVE_COLOR,
+    "pending": (0.3, 0.3, 0.3, 1),
+}
+_DEFAULT_STATUS_COLOR = _STATUS_COLORS["pending"]
+
+# FilterButton backgrounds
+_FILTER_ACTIVE_COLOR = (0.2, 0.5, 0.9, 1)
+_FILTER_INACTIVE_COLOR = (0.4, 0.4, 0.4, 1)
+
+
+_app = None
+
+
+def _get_app():
+    """Return the running app, looking it up only once."""
+    global _app
+    if _app is None:
+        _app = App.get_running_app()
+    return _app
+
+
+@lru_cache(maxsize=1024)
+def _format_event_date(date_str, fmt="%b %d, %I:%M %p"):
+    """Format an ISO date string for display, caching repeated dates."""
+    try:
+        date_obj = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        return date_obj.strftime(fmt)
+    except (ValueError, AttributeError):
+        return date_str
 
 
 class SummaryCard(BoxLayout):
-    """Summary card widget for dashboard statistics."""
+    """
+    Summary card widget for dashboard statistics.
+    
+    ``title`` and ``value`` are plain attributes that write straight
+    through to their labels rather than Kivy properties.
+    """
     
-    title = StringProperty("")
-    value = StringProperty("")
     icon = StringProperty("")
     
     def __init__(self, **kwargs):
+        # Not Kivy properties, so keep them out of the base constructor
+        title = kwargs.pop("title", "")
+        value = kwargs.pop("value", "")
         super().__init__(**kwargs)
         
         self.orientation = "vertical"
         self.size_hint_y = None
-        self.height = dp(100)
-        self.padding = [dp(10), dp(5)]
-        self.spacing = dp(5)
+        self.height = _DP100
+        self.padding = [_DP10, _DP5]
+        self.spacing = _DP5
         
         # Use background
         self.background = Image(
             source="",  # No image source needed
             allow_stretch=True,
             keep_ratio=False,
-            color=[0.95, 0.95, 0.95, 1]  # Light gray background
+            color=(0.95, 0.95, 0.95, 1)  # Light gray background
         )
         
         # Label for title
         self.title_label = Label(
-            text=self.title,
+            text=title,
             size_hint_y=None,
-            height=dp(30),
-            font_size=dp(14),
-            color=[0.4, 0.4, 0.4, 1]
+            height=_DP30,
+            font_size=_DP14,
+            color=(0.4, 0.4, 0.4, 1)
         )
         
         # Label for value
         self.value_label = Label(
-            text=self.value,
+            text=value,
             size_hint_y=None,
-            height=dp(50),
-            font_size=dp(24),
+            height=_DP50,
+            font_size=_DP24,
             bold=True
         )
         
         # Add widgets
         self.add_widget(self.title_label)
         self.add_widget(self.value_label)
-        
-        # Bind properties for updates
-        self.bind(title=self.update_title)
-        self.bind(value=self.update_value)
     
-    def update_title(self, instance, value):
-        """Update title text."""
+    @property
+    def title(self):
+        """Card title text."""
+        return self.title_label.text
+    
+    @title.setter
+    def title(self, value):
         self.title_label.text = value
     
-    def update_value(self, instance, value):
-        """Update value text."""
+    @property
+    def value(self):
+        """Card value text."""
+        return self.value_label.text
+    
+    @value.setter
+    def value(self, value):
         self.value_label.text = value
 
 
 class BetCard(ButtonBehavior, BoxLayout):
-    """Card widget for displaying a bet."""
+    """
+    Card widget for displaying a bet.
+    
+    The widget tree is declared in bettingbuddy.kv; the card only fills in
+    label text and colors when its bet changes.
+    """
     
     bet = ObjectProperty(None)
     in_parlay = BooleanProperty(False)
     selectable = BooleanProperty(False)
     remove_callback = ObjectProperty(None)
     
+    # Only created for cards shown inside a parlay
+    remove_btn = None
+    
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
-        self.orientation = "vertical"
-        self.size_hint_y = None
-        self.height = dp(100)
-        self.padding = [dp(10), dp(5)]
-        self.spacing = dp(5)
-        
-        if not self.bet:
-            # Empty card
-            self.add_widget(Label(text="No bet data"))
+        self.update_bet()
+        self.update_remove_button()
+    
+    def on_bet(self, instance, value):
+        """Refresh the card when its bet changes."""
+        self.update_bet()
+    
+    def on_in_parlay(self, instance, value):
+        """Show or hide the remove button when the parlay state changes."""
+        self.update_remove_button()
+    
+    def update_remove_button(self):
+        """Add the remove button if in parlay, drop it otherwise."""
+        if not self.ids:
             return
         
-        # Main content layout
-        self.content = BoxLayout(orientation="vertical")
+        if self.in_parlay and self.remove_btn is None:
+            self.remove_btn = self._build_remove_button()
+            self.add_widget(self.remove_btn)
+        elif not self.in_parlay and self.remove_btn is not None:
+            self.remove_widget(self.remove_btn)
+            self.remove_btn = None
+    
+    def _build_remove_button(self):
+        """Create the button that removes this bet from its parlay."""
+        remove_btn = Button(
+            text="X",
+            size_hint_x=None,
+            width=_DP30,
+            background_color=(0.8, 0.2, 0.2, 1)
+        )
+        remove_btn.bind(on_release=self.remove_from_parlay)
+        return remove_btn
+    
+    def update_bet(self):
+        """Fill the card labels from the current bet."""
+        ids = self.ids
+        if not ids:
+            # kv rules not applied yet; __init__ calls us again
+            return
         
-        # Top row with team and odds
-        self.top_row = BoxLayout(orientation="horizontal")
+        bet = self.bet
+        if not bet:
+            # Empty card
+            ids.team_label.text = "No bet data"
+            for label in (ids.odds_label, ids.description_label,
+                          ids.details_label, ids.status_label):
+                label.text = ""
+            return
         
-        self.team_label = Label(
-            text=self.bet.get("team_name", "Unknown"),
-            size_hint_x=0.7,
-            text_size=(dp(200), dp(25)),
-            halign="left",
-            valign="middle",
-            shorten=True,
-            shorten_from="right"
-        )
+        team_name = bet.get("team_name", "Unknown")
+        odds_text = bet.get("odds", "+000")
+        description = bet.get("description", "")
+        event_date = bet.get("event_date")
+        sport_text = bet.get("sport_name", "")
+        status = bet.get("status", "pending")
         
         # Get app instance for odds conversion
-        app = None
-        if hasattr(self, 'parent') and self.parent and hasattr(self.parent, 'parent'):
-            app = self.parent.parent
+        app = _get_app()
         
-        odds_text = self.bet.get("odds", "+000")
         if app and hasattr(app, 'convert_odds'):
             odds_text = app.convert_odds(odds_text)
         
-        self.odds_label = Label(
-            text=odds_text,
-            size_hint_x=0.3,
-            bold=True
-        )
-        
-        self.top_row.add_widget(self.team_label)
-        self.top_row.add_widget(self.odds_label)
-        
-        # Middle row with description
-        self.description_label = Label(
-            text=self.bet.get("description", ""),
-            size_hint_y=None,
-            height=dp(20),
-            font_size=dp(12),
-            color=[0.5, 0.5, 0.5, 1],
-            text_size=(dp(280), dp(20)),
-            halign="left",
-            valign="middle",
-            shorten=True
-        )
-        
-        # Bottom row with details and status
-        self.bottom_row = BoxLayout(orientation="horizontal")
-        
         # Format date if available
-        date_text = ""
-        event_date = self.bet.get("event_date")
-        if event_date:
-            try:
-                # Try to parse date
-                date_obj = datetime.fromisoformat(event_date.replace('Z', '+00:00'))
-                date_text = date_obj.strftime("%b %d, %I:%M %p")
-            except (ValueError, AttributeError):
-                date_text = event_date
-        
-        sport_text = self.bet.get("sport_name", "")
+        date_text = _format_event_date(event_date) if event_date else ""
         details_text = f"{sport_text} • {date_text}" if date_text else sport_text
         
-        self.details_label = Label(
-            text=details_text,
-            size_hint_x=0.7,
-            font_size=dp(12),
-            color=[0.5, 0.5, 0.5, 1],
-            text_size=(dp(200), dp(20)),
-            halign="left",
-            valign="middle",
-            shorten=True
-        )
-        
-        status = self.bet.get("status", "pending")
-        status_color = [0.3, 0.3, 0.3, 1]  # Gray for pending
-        if status == "won":
-            status_color = [0.2, 0.7, 0.2, 1]  # Green for won
-        elif status == "lost":
-            status_color = [0.7, 0.2, 0.2, 1]  # Red for lost
-        
-        self.status_label = Label(
-            text=status.capitalize(),
-            size_hint_x=0.3,
-            font_size=dp(12),
-            color=status_color
-        )
-        
-        self.bottom_row.add_widget(self.details_label)
-        self.bottom_row.add_widget(self.status_label)
-        
-        # Add all rows to content
-        self.content.add_widget(self.top_row)
-        self.content.add_widget(self.description_label)
-        self.content.add_widget(self.bottom_row)
-        
-        # Add remove button if in parlay
-        if self.in_parlay:
-            self.layout = BoxLayout(orientation="horizontal")
-            
-            self.layout.add_widget(self.content)
-            
-            self.remove_btn = Button(
-                text="X",
-                size_hint_x=None,
-                width=dp(30),
-                background_color=[0.8, 0.2, 0.2, 1]
-            )
-            self.remove_btn.bind(on_release=self.remove_from_parlay)
-            
-            self.layout.add_widget(self.remove_btn)
-            self.add_widget(self.layout)
-        else:
-            self.add_widget(self.content)
+        ids.team_label.text = team_name
+        ids.odds_label.text = odds_text
+        ids.description_label.text = description
+        ids.details_label.text = details_text
+        ids.status_label.text = status.capitalize()
+        ids.status_label.color = _STATUS_COLORS.get(status, _DEFAULT_STATUS_COLOR)
     
     def remove_from_parlay(self, instance):
         """Call the remove callback."""
@@ -221,193 +238,114 @@ class BetCard(ButtonBehavior, BoxLayout):
 
 
 class ParlayCard(ButtonBehavior, BoxLayout):
-    """Card widget for displaying a parlay."""
+    """
+    Card widget for displaying a parlay.
+    
+    Layout lives in bettingbuddy.kv; see BetCard.
+    """
     
     parlay = ObjectProperty(None)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.update_parlay()
+    
+    def on_parlay(self, instance, value):
+        """Refresh the card when its parlay changes."""
+        self.update_parlay()
+    
+    def update_parlay(self):
+        """Fill the card labels from the current parlay."""
+        ids = self.ids
+        if not ids:
+            return
         
-        self.orientation = "vertical"
-        self.size_hint_y = None
-        self.height = dp(100)
-        self.padding = [dp(10), dp(5)]
-        self.spacing = dp(5)
-        
-        if not self.parlay:
+        parlay = self.parlay
+        if not parlay:
             # Empty card
-            self.add_widget(Label(text="No parlay data"))
+            ids.count_label.text = "No parlay data"
+            for label in (ids.stake_label, ids.odds_label, ids.payout_label,
+                          ids.date_label, ids.status_label):
+                label.text = ""
             return
         
-        # Top row with bet count and stake
-        self.top_row = BoxLayout(orientation="horizontal")
-        
-        bet_count = self.parlay.get("bet_count", 0)
-        bet_text = f"{bet_count} Bet Parlay" if bet_count == 1 else f"{bet_count} Bet Parlay"
-        
-        self.count_label = Label(
-            text=bet_text,
-            size_hint_x=0.7,
-            bold=True,
-            text_size=(dp(200), dp(25)),
-            halign="left",
-            valign="middle"
-        )
-        
-        stake = self.parlay.get("stake", 0)
-        self.stake_label = Label(
-            text=f"${stake:.2f}",
-            size_hint_x=0.3
-        )
-        
-        self.top_row.add_widget(self.count_label)
-        self.top_row.add_widget(self.stake_label)
-        
-        # Middle row with odds and payout
-        self.middle_row = BoxLayout(orientation="horizontal")
+        bet_count = parlay.get("bet_count", 0)
+        stake = parlay.get("stake", 0)
+        odds_text = parlay.get("total_odds", "+000")
+        payout = parlay.get("potential_payout", 0)
+        created_at = parlay.get("created_at")
+        status = parlay.get("status", "pending")
         
         # Get app instance for odds conversion
-        app = None
-        if hasattr(self, 'parent') and self.parent and hasattr(self.parent, 'parent'):
-            app = self.parent.parent
+        app = _get_app()
         
-        odds_text = self.parlay.get("total_odds", "+000")
         if app and hasattr(app, 'convert_odds'):
             odds_text = app.convert_odds(odds_text)
         
-        self.odds_label = Label(
-            text=f"Odds: {odds_text}",
-            size_hint_x=0.6,
-            text_size=(dp(180), dp(20)),
-            halign="left",
-            valign="middle"
-        )
-        
-        payout = self.parlay.get("potential_payout", 0)
-        self.payout_label = Label(
-            text=f"Payout: ${payout:.2f}",
-            size_hint_x=0.4,
-            bold=True,
-            color=[0.2, 0.7, 0.2, 1],
-            text_size=(dp(120), dp(20)),
-            halign="right",
-            valign="middle"
-        )
-        
-        self.middle_row.add_widget(self.odds_label)
-        self.middle_row.add_widget(self.payout_label)
-        
-        # Bottom row with date and status
-        self.bottom_row = BoxLayout(orientation="horizontal")
-        
         # Format creation date
-        date_text = ""
-        created_at = self.parlay.get("created_at")
-        if created_at:
-            try:
-                # Try to parse date
-                date_obj = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-                date_text = date_obj.strftime("%b %d, %Y")
-            except (ValueError, AttributeError):
-                date_text = created_at
-        
-        self.date_label = Label(
-            text=date_text,
-            size_hint_x=0.7,
-            font_size=dp(12),
-            color=[0.5, 0.5, 0.5, 1],
-            text_size=(dp(200), dp(20)),
-            halign="left",
-            valign="middle"
-        )
-        
-        status = self.parlay.get("status", "pending")
-        status_color = [0.3, 0.3, 0.3, 1]  # Gray for pending
-        if status == "won":
-            status_color = [0.2, 0.7, 0.2, 1]  # Green for won
-        elif status == "lost":
-            status_color = [0.7, 0.2, 0.2, 1]  # Red for lost
-        
-        self.status_label = Label(
-            text=status.capitalize(),
-            size_hint_x=0.3,
-            font_size=dp(12),
-            color=status_color
-        )
-        
-        self.bottom_row.add_widget(self.date_label)
-        self.bottom_row.add_widget(self.status_label)
-        
-        # Add all rows
-        self.add_widget(self.top_row)
-        self.add_widget(self.middle_row)
-        self.add_widget(self.bottom_row)
+        date_text = _format_event_date(created_at, "%b %d, %Y") if created_at else ""
+        
+        ids.count_label.text = f"{bet_count} Bet Parlay"
+        ids.stake_label.text = f"${stake:.2f}"
+        ids.odds_label.text = f"Odds: {odds_text}"
+        ids.payout_label.text = f"Payout: ${payout:.2f}"
+        ids.date_label.text = date_text
+        ids.status_label.text = status.capitalize()
+        ids.status_label.color = _STATUS_COLORS.get(status, _DEFAULT_STATUS_COLOR)
 
 
 class RecommendationCard(ButtonBehavior, BoxLayout):
-    """Card widget for displaying a recommendation."""
+    """
+    Card widget for displaying a recommendation.
+    
+    Header and footer live in bettingbuddy.kv; the team rows vary with
+    the number of legs and are built here.
+    """
     
     recommendation = ObjectProperty(None)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self.update_recommendation()
+    
+    def on_recommendation(self, instance, value):
+        """Refresh the card when its recommendation changes."""
+        self.update_recommendation()
+    
+    def update_recommendation(self):
+        """Fill the card from the current recommendation."""
+        ids = self.ids
+        if not ids:
+            return
         
-        self.orientation = "vertical"
-        self.size_hint_y = None
-        self.height = dp(120)
-        self.padding = [dp(10), dp(5)]
-        self.spacing = dp(5)
+        teams_list = ids.teams_list
+        teams_list.clear_widgets()
         
-        if not self.recommendation:
+        rec = self.recommendation
+        if not rec:
             # Empty card
-            self.add_widget(Label(text="No recommendation data"))
+            ids.type_label.text = "No recommendation data"
+            for label in (ids.value_label, ids.odds_label, ids.ev_label):
+                label.text = ""
             return
         
-        # Header - recommendation type and value
-        self.header = BoxLayout(
-            orientation="horizontal",
-            size_hint_y=None,
-            height=dp(30)
-        )
+        rec_type = rec.get("recommendation_type", "")
+        bets = rec.get("bets", [])
+        bet_count = len(bets)
+        win_prob = rec.get("win_probability", 0)
+        american_odds = rec.get("american_odds", "+100")
+        expected_value = rec.get("expected_value", 0)
         
-        rec_type = self.recommendation.get("recommendation_type", "")
         if rec_type == "single_bets":
             type_text = "Single Bet"
         else:
-            leg_count = len(self.recommendation.get("bets", []))
-            type_text = f"{leg_count}-Leg Parlay"
-        
-        self.type_label = Label(
-            text=type_text,
-            size_hint_x=0.7,
-            bold=True,
-            text_size=(dp(200), dp(30)),
-            halign="left",
-            valign="middle"
-        )
-        
-        win_prob = self.recommendation.get("win_probability", 0)
-        self.value_label = Label(
-            text=f"Win prob: {win_prob:.1f}%",
-            size_hint_x=0.3,
-            color=[0.2, 0.7, 0.2, 1] if win_prob > 60 else [0.5, 0.5, 0.5, 1],
-            text_size=(dp(100), dp(30)),
-            halign="right",
-            valign="middle"
-        )
+            type_text = f"{bet_count}-Leg Parlay"
         
-        self.header.add_widget(self.type_label)
-        self.header.add_widget(self.value_label)
+        ids.type_label.text = type_text
+        ids.value_label.text = f"Win prob: {win_prob:.1f}%"
+        ids.value_label.color = _POSITIVE_COLOR if win_prob > 60 else _SECONDARY_TEXT_COLOR
         
-        # Teams list
-        self.teams_list = BoxLayout(
-            orientation="vertical",
-            size_hint_y=None,
-            height=dp(50)
-        )
-        
-        bets = self.recommendation.get("bets", [])
-        for i, bet in enumerate(bets[:3]):  # Show up to 3 bets
+        for bet in islice(bets, 3):  # Show up to 3 bets
             team_name = bet.get("team_name", "Unknown")
             odds = bet.get("odds", "+000")
             
@@ -416,8 +354,8 @@ class RecommendationCard(ButtonBehavior, BoxLayout):
             team_label = Label(
                 text=team_name,
                 size_hint_x=0.7,
-                font_size=dp(12),
-                text_size=(dp(200), dp(15)),
+                font_size=_DP12,
+                text_size=_TEXT_SIZE_200x15,
                 halign="left",
                 valign="middle",
                 shorten=True
@@ -426,8 +364,8 @@ class RecommendationCard(ButtonBehavior, BoxLayout):
             odds_label = Label(
                 text=odds,
                 size_hint_x=0.3,
-                font_size=dp(12),
-                text_size=(dp(100), dp(15)),
+                font_size=_DP12,
+                text_size=_TEXT_SIZE_100x15,
                 halign="right",
                 valign="middle"
             )
@@ -435,57 +373,22 @@ class RecommendationCard(ButtonBehavior, BoxLayout):
             team_row.add_widget(team_label)
             team_row.add_widget(odds_label)
             
-            self.teams_list.add_widget(team_row)
+            teams_list.add_widget(team_row)
             
-        if len(bets) > 3:
+        if bet_count > 3:
             # Indicate there are more bets
             more_label = Label(
-                text=f"+ {len(bets) - 3} more...",
+                text=f"+ {bet_count - 3} more...",
                 size_hint_y=None,
-                height=dp(15),
-                font_size=dp(12),
-                color=[0.5, 0.5, 0.5, 1]
+                height=_DP15,
+                font_size=_DP12,
+                color=_SECONDARY_TEXT_COLOR
             )
-            self.teams_list.add_widget(more_label)
-        
-        # Footer with odds and potential payout
-        self.footer = BoxLayout(
-            orientation="horizontal",
-            size_hint_y=None,
-            height=dp(30)
-        )
-        
-        decimal_odds = self.recommendation.get("decimal_odds", 1.0)
-        american_odds = self.recommendation.get("american_odds", "+100")
-        
-        self.odds_label = Label(
-            text=f"Total odds: {american_odds}",
-            size_hint_x=0.7,
-            font_size=dp(12),
-            text_size=(dp(200), dp(30)),
-            halign="left",
-            valign="middle"
-        )
-        
-        expected_value = self.recommendation.get("expected_value", 0)
-        ev_color = [0.2, 0.7, 0.2, 1] if expected_value > 0 else [0.7, 0.2, 0.2, 1]
-        self.ev_label = Label(
-            text=f"EV: {expected_value:.2f}",
-            size_hint_x=0.3,
-            font_size=dp(12),
-            color=ev_color,
-            text_size=(dp(100), dp(30)),
-            halign="right",
-            valign="middle"
-        )
-        
-        self.footer.add_widget(self.odds_label)
-        self.footer.add_widget(self.ev_label)
+            teams_list.add_widget(more_label)
         
-        # Add all sections
-        self.add_widget(self.header)
-        self.add_widget(self.teams_list)
-        self.add_widget(self.footer)
+        ids.odds_label.text = f"Total odds: {american_odds}"
+        ids.ev_label.text = f"EV: {expected_value:.2f}"
+        ids.ev_label.color = _POSITIVE_COLOR if expected_value > 0 else _NEGATIVE_COLOR
 
 
 class FilterButton(Button):
@@ -503,7 +406,18 @@ class FilterButton(Button):
     
     def update_state(self, *args):
         """Update the button appearance based on active state."""
-        if self.active:
-            self.background_color = [0.2, 0.5, 0.9, 1]  # Highlighted color
-        else:
-            self.background_color = [0.4, 0.4, 0.4, 1]  # Regular color
+        color = _FILTER_ACTIVE_COLOR if self.active else _FILTER_INACTIVE_COLOR
+        
+        # Skip the redraw if the button already shows this color
+        if tuple(self.background_color) != color:
+            self.background_color = color
+
+
+class StateButton(Button):
+    """Button whose highlighted background follows its active state.
+    
+    The background is drawn by a canvas rule in the kv file, so toggling
+    ``active`` only dispatches when the state actually changes.
+    """
+    
+    active = BooleanProperty(False)
@@ -4,10 +4,138 @@ BettingBuddy Value Betting Module
 This module implements value betting algorithms to identify bets with positive expected value.
 """
 
+import heapq
 import math
+from functools import lru_cache, partial
+from itertools import islice
+from operator import attrgetter
 from typing import List, Dict, Tuple, Optional, Any, Union
 from models import Bet, Parlay, Team, Sport
-from database import american_to_decimal, decimal_to_american
+from database import american_to_decimal as _american_to_decimal, decimal_to_american
+
+# American odds come from a small set of strings that repeat across a slate
+american_to_decimal = lru_cache(maxsize=2048)(_american_to_decimal)
+
+# Maximum share of bankroll a single Kelly stake may use
+KELLY_CAP = 0.2
+
+
+def _kelly_fraction(decimal_odds: float, true_probability: float,
+                    fraction: float = 1.0, cap: float = KELLY_CAP) -> float:
+    """
+    Kelly stake for decimal odds, scaled by fraction and clamped to [0, cap].
+    
+    Args:
+        decimal_odds (float): Bookmaker odds in decimal format
+        true_probability (float): Estimated true probability (0.0-1.0)
+        fraction (float): Kelly fraction to reduce volatility (0.0-1.0)
+        cap (float): Maximum fraction of bankroll
+        
+    Returns:
+        float: Bet size as a fraction of bankroll
+    """
+    b = decimal_odds - 1  # Decimal odds minus 1
+    if b <= 0:
+        return 0.0
+    
+    # Kelly formula: (bp - q) / b = p - q / b
+    # Where b = decimal odds - 1, p = probability of winning, q = probability of losing
+    kelly = fraction * (true_probability - (1 - true_probability) / b)
+    
+    return 0.0 if kelly < 0 else (cap if kelly > cap else kelly)
+
+
+@lru_cache(maxsize=4096)
+def _analyze_odds_core(decimal_odds: float, true_probability: float,
+                       min_edge: float, confidence_threshold: float) -> Tuple:
+    """
+    Pure value-bet math behind ValueBettingAnalyzer.analyze_odds.
+    
+    Args:
+        decimal_odds (float): Bookmaker odds in decimal format
+        true_probability (float): Estimated true probability of winning (0.0-1.0)
+        min_edge (float): Minimum edge for a value bet
+        confidence_threshold (float): Minimum true probability for a value bet
+        
+    Returns:
+        Tuple: (is_value_bet, ev %, edge %, fair American odds, confidence)
+    """
+    # Calculate implied probability from bookmaker odds
+    implied_prob = 1 / decimal_odds
+    
+    # Calculate fair odds from true probability
+    fair_decimal_odds = 1 / true_probability if true_probability > 0 else 100
+    fair_american_odds = decimal_to_american(fair_decimal_odds)
+    
+    # Calculate edge
+    edge = true_probability - implied_prob
+    
+    # Calculate expected value
+    ev = (decimal_odds * true_probability) - 1
+    
+    # Determine if this is a value bet
+    is_value_bet = (edge >= min_edge and true_probability >= confidence_threshold)
+    
+    # Calculate confidence score (higher number is better)
+    # Accounts for both probability and edge
+    confidence = true_probability * (1 + edge)
+    
+    return is_value_bet, ev * 100, edge * 100, fair_american_odds, confidence
+
+
+class BetAnalysis:
+    """
+    Value analysis of a single bet, as produced by find_best_value_bets.
+    """
+    
+    __slots__ = ('is_value_bet', 'ev', 'edge', 'fair_odds', 'confidence',
+                 'team_name', 'odds', 'true_probability', 'sport', 'event_date',
+                 'bet_id', 'recommended_stake', 'percentage_of_bankroll')
+    
+    def __init__(self, is_value_bet, ev, edge, fair_odds, confidence,
+                 team_name, odds, true_probability, sport=None, event_date=None,
+                 bet_id=None, recommended_stake=0.0, percentage_of_bankroll=0.0):
+        """
+        Initialize a BetAnalysis object.
+        
+        Args:
+            is_value_bet (bool): True if this is a value bet
+            ev (float): Expected value (%)
+            edge (float): Edge percentage
+            fair_odds (str): Fair odds based on true probability
+            confidence (float): Confidence score
+            team_name (str): Team name
+            odds (str): Bookmaker odds in American format
+            true_probability (float): Estimated true probability (0.0-1.0)
+            sport (str, optional): Sport name
+            event_date (str, optional): Event date
+            bet_id (int, optional): ID of the analyzed bet in the database
+            recommended_stake (float, optional): Recommended stake amount
+            percentage_of_bankroll (float, optional): Stake as a bankroll percentage
+        """
+        self.is_value_bet = is_value_bet
+        self.ev = ev
+        self.edge = edge
+        self.fair_odds = fair_odds
+        self.confidence = confidence
+        self.team_name = team_name
+        self.odds = odds
+        self.true_probability = true_probability
+        self.sport = sport
+        self.event_date = event_date
+        self.bet_id = bet_id
+        self.recommended_stake = recommended_stake
+        self.percentage_of_bankroll = percentage_of_bankroll
+    
+    def to_dict(self):
+        """
+        Convert BetAnalysis object to dictionary.
+        
+        Returns:
+            dict: Dictionary representation of the analysis
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
 
 class ValueBettingAnalyzer:
     """
@@ -48,36 +176,21 @@ class ValueBettingAnalyzer:
                 - fair_odds (str): Fair odds based on true probability
                 - confidence (float): Confidence score
         """
-        # Calculate implied probability from bookmaker odds
-        decimal_odds = american_to_decimal(bookmaker_odds)
-        implied_prob = 1 / decimal_odds
-        
-        # Calculate fair odds from true probability
-        fair_decimal_odds = 1 / true_probability if true_probability > 0 else 100
-        fair_american_odds = decimal_to_american(fair_decimal_odds)
-        
-        # Calculate edge
-        edge = true_probability - implied_prob
-        
-        # Calculate expected value
-        ev = (decimal_odds * true_probability) - 1
-        
-        # Determine if this is a value bet
-        is_value_bet = (edge >= self.min_edge and true_probability >= self.confidence_threshold)
-        
-        # Calculate confidence score (higher number is better)
-        # Accounts for both probability and edge
-        confidence = true_probability * (1 + edge)
+        is_value_bet, ev, edge, fair_american_odds, confidence = _analyze_odds_core(
+            american_to_decimal(bookmaker_odds), true_probability,
+            self.min_edge, self.confidence_threshold
+        )
         
+        # Build a fresh dict each call, callers add their own fields to it
         return {
             'is_value_bet': is_value_bet,
-            'ev': ev * 100,  # Convert to percentage
-            'edge': edge * 100,  # Convert to percentage
+            'ev': ev,  # Percentage
+            'edge': edge,  # Percentage
             'fair_odds': fair_american_odds,
             'confidence': confidence
         }
     
-    def find_best_value_bets(self, bets_data: List[Dict[str, Any]], max_bets=5) -> List[Dict[str, Any]]:
+    def find_best_value_bets(self, bets_data: List[Dict[str, Any]], max_bets=5) -> List[BetAnalysis]:
         """
         Find the best value bets from a list of potential bets.
         
@@ -86,38 +199,45 @@ class ValueBettingAnalyzer:
                 - team_name: Team name
                 - odds: Bookmaker odds in American format
                 - true_probability: Your estimated true probability (0.0-1.0)
+                - bet_id (optional): Database ID, carried into the analysis
             max_bets (int): Maximum number of bets to return
                 
         Returns:
-            List[Dict]: List of best value bets with analysis data
+            List[BetAnalysis]: Best value bets with analysis data
         """
-        analyzed_bets = []
+        value_bets = []
+        confidence_threshold = self.confidence_threshold
+        min_edge = self.min_edge
         
         for bet in bets_data:
             if 'true_probability' not in bet or 'odds' not in bet:
                 continue
-                
-            analysis = self.analyze_odds(bet['odds'], bet['true_probability'])
             
-            # Add bet data to analysis
-            analysis.update({
-                'team_name': bet.get('team_name', 'Unknown'),
-                'odds': bet['odds'],
-                'true_probability': bet['true_probability'],
-                'sport': bet.get('sport', 'Unknown'),
-                'event_date': bet.get('event_date')
-            })
+            # Cheap checks first, bets failing either can't be value bets
+            true_probability = bet['true_probability']
+            if true_probability < confidence_threshold:
+                continue
             
-            analyzed_bets.append(analysis)
-        
-        # Sort by confidence score in descending order
-        analyzed_bets.sort(key=lambda x: x['confidence'], reverse=True)
-        
-        # Filter to value bets only
-        value_bets = [b for b in analyzed_bets if b['is_value_bet']]
-        
-        # Return top N value bets
-        return value_bets[:max_bets]
+            # Parse the odds string once, the math below works on decimal odds
+            odds = bet['odds']
+            decimal_odds = american_to_decimal(odds)
+            if true_probability - 1 / decimal_odds < min_edge:
+                continue
+                
+            # Build the record straight from the analysis tuple, no
+            # intermediate analysis dict
+            value_bets.append(BetAnalysis(
+                *_analyze_odds_core(decimal_odds, true_probability, min_edge, confidence_threshold),
+                team_name=bet.get('team_name', 'Unknown'),
+                odds=odds,
+                true_probability=true_probability,
+                sport=bet.get('sport', 'Unknown'),
+                event_date=bet.get('event_date'),
+                bet_id=bet.get('bet_id')
+            ))
+        
+        # Return top N value bets by confidence score
+        return heapq.nlargest(max_bets, value_bets, key=attrgetter('confidence'))
     
     def kelly_criterion(self, odds: str, true_probability: float, 
                         fraction: float = 1.0) -> float:
@@ -132,19 +252,23 @@ class ValueBettingAnalyzer:
         Returns:
             float: Optimal bet size as a fraction of bankroll
         """
-        decimal_odds = american_to_decimal(odds)
-        b = decimal_odds - 1  # Decimal odds minus 1
-        q = 1 - true_probability  # Probability of losing
-        
-        # Kelly formula: (bp - q) / b
-        # Where b = decimal odds - 1, p = probability of winning, q = probability of losing
-        kelly = (b * true_probability - q) / b if b > 0 else 0
-        
-        # Apply Kelly fraction to reduce volatility
-        kelly = kelly * fraction
+        return _kelly_fraction(american_to_decimal(odds), true_probability, fraction)
+    
+    def kelly_criterion_batch(self, odds_list: List[str], probabilities: List[float],
+                              fraction: float = 1.0) -> List[float]:
+        """
+        Calculate Kelly bet sizes for many bets at once.
         
-        # Cap at max 20% of bankroll as a safety measure
-        return min(kelly, 0.2)
+        Args:
+            odds_list (List[str]): Bookmaker odds in American format
+            probabilities (List[float]): Estimated true probabilities, one per odds
+            fraction (float): Kelly fraction to reduce volatility (0.0-1.0)
+            
+        Returns:
+            List[float]: Optimal bet sizes as fractions of bankroll
+        """
+        return [_kelly_fraction(american_to_decimal(odds), p, fraction)
+                for odds, p in zip(odds_list, probabilities)]
     
     def suggest_parlay(self, value_bets: List[Dict[str, Any]], 
                       max_legs=3, min_correlation=-0.2) -> Dict[str, Any]:
@@ -166,35 +290,38 @@ class ValueBettingAnalyzer:
         sorted_bets = sorted(value_bets, key=lambda x: x['ev'], reverse=True)
         
         # Take top bets with low correlation
-        parlay_bets = []
-        parlay_bets.append(sorted_bets[0])  # Always add the best bet
+        best_bet = sorted_bets[0]  # Always add the best bet
+        parlay_bets = [best_bet]
+        used_sports = {best_bet.get('sport')}
+        
+        # Collect leg values as bets are accepted for the reductions below
+        probabilities = [best_bet['true_probability']]
+        decimal_odds = [american_to_decimal(best_bet['odds'])]
         
-        for bet in sorted_bets[1:]:
+        for bet in islice(sorted_bets, 1, None):
+            if len(parlay_bets) >= max_legs:
+                break
+            
             # Simple correlation check - different sports have low correlation
             # In a real implementation, you would use actual correlation data
-            if len(parlay_bets) < max_legs:
-                # Check if the bet is from a different sport than existing bets
-                different_sport = all(bet.get('sport') != existing.get('sport') 
-                                    for existing in parlay_bets)
-                
-                if different_sport:
-                    parlay_bets.append(bet)
+            sport = bet.get('sport')
+            if sport not in used_sports:
+                parlay_bets.append(bet)
+                used_sports.add(sport)
+                probabilities.append(bet['true_probability'])
+                decimal_odds.append(american_to_decimal(bet['odds']))
         
         if len(parlay_bets) < 2:
             return None  # Need at least 2 legs for a parlay
             
         # Calculate combined probability and odds
-        combined_prob = 1.0
-        for bet in parlay_bets:
-            combined_prob *= bet['true_probability']
+        combined_prob = math.prod(probabilities)
             
         fair_decimal_odds = 1 / combined_prob if combined_prob > 0 else 100
         fair_american_odds = decimal_to_american(fair_decimal_odds)
         
         # Calculate parlay's decimal odds
-        parlay_decimal_odds = 1.0
-        for bet in parlay_bets:
-            parlay_decimal_odds *= american_to_decimal(bet['odds'])
+        parlay_decimal_odds = math.prod(decimal_odds)
             
         parlay_american_odds = decimal_to_american(parlay_decimal_odds)
         
@@ -229,9 +356,28 @@ class ValueBettingAnalyzer:
             return model_probability
             
         # Calculate historical win rate
-        total_matches = len(historical_data)
         wins = sum(1 for match in historical_data if match.get('result') == 'win')
-        historical_prob = wins / total_matches if total_matches > 0 else 0.5
+        return self.calculate_true_probability_from_record(
+            wins, len(historical_data), model_probability
+        )
+    
+    def calculate_true_probability_from_record(self, wins: int, total_matches: int,
+                                               model_probability: float) -> float:
+        """
+        Calculate a true probability estimate from a win/loss record.
+        
+        Args:
+            wins (int): Number of historical wins
+            total_matches (int): Number of historical matches
+            model_probability (float): Probability from predictive model
+            
+        Returns:
+            float: Adjusted true probability
+        """
+        if total_matches <= 0:
+            return model_probability
+        
+        historical_prob = wins / total_matches
         
         # Calculate weight based on sample size
         # More historical data = more weight
@@ -262,6 +408,17 @@ class ValueBettingStrategy:
         self.stake_percentage = 0.02  # 2% of bankroll for flat betting
         self.kelly_fraction = 0.5  # Half-Kelly for reduced volatility
     
+    @property
+    def kelly_fraction(self):
+        """Kelly fraction used to scale Kelly stakes."""
+        return self._kelly_fraction
+    
+    @kelly_fraction.setter
+    def kelly_fraction(self, fraction):
+        self._kelly_fraction = fraction
+        # Bind the fraction once so each Kelly stake is a plain two-argument call
+        self._kelly_fn = partial(_kelly_fraction, fraction=fraction, cap=KELLY_CAP)
+    
     def set_bankroll_strategy(self, strategy='kelly', stake_percentage=0.02, 
                              kelly_fraction=0.5):
         """
@@ -276,7 +433,41 @@ class ValueBettingStrategy:
         self.stake_percentage = max(0.01, min(0.1, stake_percentage))
         self.kelly_fraction = max(0.1, min(1.0, kelly_fraction))
     
-    def calculate_bet_size(self, bankroll: float, odds: str, true_probability: float) -> float:
+    def _kelly_stake(self, bankroll, odds, true_probability, edge=None):
+        """Stake a fraction of the bankroll given by the Kelly Criterion."""
+        return bankroll * self._kelly_fn(american_to_decimal(odds), true_probability)
+    
+    def _flat_stake(self, bankroll, odds, true_probability, edge=None):
+        """Stake a fixed percentage of the bankroll."""
+        return bankroll * self.stake_percentage
+    
+    def _percentage_stake(self, bankroll, odds, true_probability, edge=None):
+        """Stake a percentage of the bankroll scaled up by the bet's edge."""
+        if edge is None:
+            edge = self.analyzer.analyze_odds(odds, true_probability)['edge'] / 100
+        
+        # Adjust percentage based on edge
+        adjusted_pct = self.stake_percentage * (1.0 + edge)
+        return bankroll * min(adjusted_pct, 0.1)  # Cap at 10%
+    
+    def _get_stake_function(self):
+        """
+        Get the stake function for the current bankroll management strategy.
+        
+        Returns:
+            callable: Function taking (bankroll, odds, true_probability, edge)
+        """
+        stake_functions = {
+            'kelly': self._kelly_stake,
+            'flat': self._flat_stake,
+            'percentage': self._percentage_stake
+        }
+        
+        # Default to flat betting
+        return stake_functions.get(self.bankroll_management, self._flat_stake)
+    
+    def calculate_bet_size(self, bankroll: float, odds: str, true_probability: float,
+                           edge: Optional[float] = None) -> float:
         """
         Calculate bet size based on bankroll management strategy.
         
@@ -284,28 +475,12 @@ class ValueBettingStrategy:
             bankroll (float): Current bankroll amount
             odds (str): Bookmaker odds in American format
             true_probability (float): Estimated true probability
+            edge (float, optional): Precomputed edge (0.0-1.0), saves re-analyzing the odds
             
         Returns:
             float: Recommended bet size
         """
-        if self.bankroll_management == 'kelly':
-            kelly_pct = self.analyzer.kelly_criterion(
-                odds, true_probability, self.kelly_fraction
-            )
-            return bankroll * kelly_pct
-            
-        elif self.bankroll_management == 'flat':
-            return bankroll * self.stake_percentage
-            
-        elif self.bankroll_management == 'percentage':
-            # Adjust percentage based on edge
-            analysis = self.analyzer.analyze_odds(odds, true_probability)
-            edge_factor = 1.0 + (analysis['edge'] / 100)
-            adjusted_pct = self.stake_percentage * edge_factor
-            return bankroll * min(adjusted_pct, 0.1)  # Cap at 10%
-        
-        # Default to flat betting
-        return bankroll * self.stake_percentage
+        return self._get_stake_function()(bankroll, odds, true_probability, edge)
     
     def generate_betting_plan(self, bankroll: float, available_bets: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -321,13 +496,19 @@ class ValueBettingStrategy:
         # Find value bets
         value_bets = self.analyzer.find_best_value_bets(available_bets)
         
-        # Calculate bet sizes
+        # Calculate bet sizes and total exposure in the same pass
+        total_exposure = 0
+        stake_function = self._get_stake_function()
         for bet in value_bets:
-            bet_size = self.calculate_bet_size(
-                bankroll, bet['odds'], bet['true_probability']
+            bet_size = stake_function(
+                bankroll, bet.odds, bet.true_probability, bet.edge / 100
             )
-            bet['recommended_stake'] = round(bet_size, 2)
-            bet['percentage_of_bankroll'] = (bet_size / bankroll) * 100
+            bet.recommended_stake = round(bet_size, 2)
+            bet.percentage_of_bankroll = (bet_size / bankroll) * 100
+            total_exposure += bet.recommended_stake
+        
+        # Plans are consumed as plain dicts by the UI
+        value_bets = [bet.to_dict() for bet in value_bets]
         
         # Generate parlay suggestion
         parlay_suggestion = self.analyzer.suggest_parlay(value_bets)
@@ -340,7 +521,6 @@ class ValueBettingStrategy:
         return {
             'value_bets': value_bets,
             'parlay_suggestion': parlay_suggestion,
-            'total_recommended_exposure': sum(bet.get('recommended_stake', 0) 
-                                            for bet in value_bets),
+            'total_recommended_exposure': total_exposure,
             'bankroll': bankroll
         }
\ No newline at end of file
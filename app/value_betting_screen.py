@@ -6,8 +6,12 @@ This module contains the UI components for value betting analysis.
 
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.scrollview import ScrollView
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
@@ -18,20 +22,79 @@ from kivy.metrics import dp
 from kivy.utils import get_color_from_hex
 from kivy.clock import Clock
 from kivy.animation import Animation
-from kivy.properties import StringProperty, NumericProperty, BooleanProperty, ListProperty
+from kivy.properties import StringProperty, NumericProperty, BooleanProperty, ListProperty, ObjectProperty
 from kivy.graphics import Color, Rectangle
 
 from datetime import datetime
+import copy
 import json
+import math
+import re
+import threading
+from functools import lru_cache
 
 from models import Bet, Parlay, Team, Sport, UserPreferences
-from database import BettingDatabase, calculate_parlay_odds, calculate_payout
-from value_betting import ValueBettingAnalyzer, ValueBettingStrategy
+from database import BettingDatabase, calculate_parlay_odds, calculate_payout, decimal_to_american
+# Memoized odds conversion, shares its cache with the analyzer
+from value_betting import ValueBettingAnalyzer, ValueBettingStrategy, american_to_decimal
 from api_service import APIService
 from animations import fade_in, fade_out, slide_in_right, pulse, bounce_in
 
-class ValueBetItem(BoxLayout):
-    """Widget representing a value bet item."""
+# Numeric part of American odds strings such as '+150' or '-110'
+_ODDS_RE = re.compile(r'[+-]?\d+')
+
+# Colors used across the screen, parsed once
+_GREEN_COLOR = tuple(get_color_from_hex('#4CAF50'))
+_GREY_COLOR = tuple(get_color_from_hex('#9E9E9E'))
+_ORANGE_COLOR = tuple(get_color_from_hex('#FF9800'))
+_BLUE_COLOR = tuple(get_color_from_hex('#2196F3'))
+_RED_COLOR = tuple(get_color_from_hex('#F44336'))
+
+# Lists longer than this fade in all at once
+_MAX_STAGGERED_ITEMS = 20
+
+
+@lru_cache(maxsize=512)
+def _simulated_true_probability(odds):
+    """
+    Generate a simulated true probability for demonstration.
+    
+    In a real app, this would come from a model or user input. It only
+    depends on the odds, so it is computed once per distinct odds string.
+    
+    Args:
+        odds (str): Bookmaker odds in American format
+        
+    Returns:
+        float: Simulated true probability (0.05-0.95)
+    """
+    # Extract numerical part from odds
+    odds_value = _ODDS_RE.search(odds)
+    if not odds_value:
+        return 0.5  # Default
+    
+    odds_value = int(odds_value.group())
+    
+    # Generate a true probability that's slightly better than implied
+    implied_prob = 1 / american_to_decimal(odds)
+    
+    # For demonstration, we'll make favorable odds seem more valuable
+    if odds_value > 0:  # Underdog
+        true_prob = implied_prob * (1 + 0.15)  # 15% edge on underdogs
+    else:  # Favorite
+        true_prob = implied_prob * (1 + 0.05)  # 5% edge on favorites
+    
+    # Cap at reasonable values
+    return min(0.95, max(0.05, true_prob))
+
+
+class ValueBetItem(RecycleDataViewBehavior, BoxLayout):
+    """
+    Widget representing a value bet item, recycled by the value bets RecycleView.
+    
+    The layout and the label/button bindings come from the <ValueBetItem>
+    rule in bettingbuddy.kv.
+    """
     
     team_name = StringProperty('')
     odds = StringProperty('')
@@ -39,145 +102,20 @@ class ValueBetItem(BoxLayout):
     is_value_bet = BooleanProperty(False)
     confidence = NumericProperty(0)
     recommended_stake = NumericProperty(0)
+    selected = BooleanProperty(False)
+    bet_data = ObjectProperty(None, allownone=True)
+    screen = ObjectProperty(None, allownone=True)
+    index = None
     
-    def __init__(self, **kwargs):
-        super(ValueBetItem, self).__init__(**kwargs)
-        self.orientation = 'vertical'
-        self.padding = dp(10)
-        self.spacing = dp(5)
-        self.size_hint_y = None
-        self.height = dp(130)
-        
-        # Top row with team and odds
-        top_row = BoxLayout(
-            orientation='horizontal',
-            size_hint=(1, None),
-            height=dp(30)
-        )
-        
-        self.team_label = Label(
-            text=self.team_name,
-            size_hint=(0.7, 1),
-            halign='left',
-            text_size=(None, dp(30)),
-            bold=True
-        )
-        
-        self.odds_label = Label(
-            text=self.odds,
-            size_hint=(0.3, 1),
-            halign='right',
-            text_size=(None, dp(30)),
-            bold=True
-        )
-        
-        top_row.add_widget(self.team_label)
-        top_row.add_widget(self.odds_label)
-        
-        # Middle row with stats
-        stats_row = GridLayout(
-            cols=2,
-            size_hint=(1, None),
-            height=dp(60),
-            spacing=[dp(10), dp(5)]
-        )
-        
-        # EV label
-        stats_row.add_widget(Label(
-            text='Expected Value:',
-            halign='left',
-            valign='middle',
-            text_size=(None, dp(20))
-        ))
-        
-        self.ev_label = Label(
-            text=f"{self.expected_value:.2f}%",
-            halign='right',
-            valign='middle',
-            text_size=(None, dp(20)),
-            color=(0, 1, 0, 1) if self.expected_value > 0 else (1, 0, 0, 1)
-        )
-        stats_row.add_widget(self.ev_label)
-        
-        # Confidence label
-        stats_row.add_widget(Label(
-            text='Confidence:',
-            halign='left',
-            valign='middle',
-            text_size=(None, dp(20))
-        ))
-        
-        self.confidence_label = Label(
-            text=f"{self.confidence:.2f}",
-            halign='right',
-            valign='middle',
-            text_size=(None, dp(20))
-        )
-        stats_row.add_widget(self.confidence_label)
-        
-        # Stake label
-        stats_row.add_widget(Label(
-            text='Recommended Stake:',
-            halign='left',
-            valign='middle',
-            text_size=(None, dp(20))
-        ))
-        
-        self.stake_label = Label(
-            text=f"${self.recommended_stake:.2f}",
-            halign='right',
-            valign='middle',
-            text_size=(None, dp(20))
-        )
-        stats_row.add_widget(self.stake_label)
-        
-        # Bottom row with action button
-        bottom_row = BoxLayout(
-            orientation='horizontal',
-            size_hint=(1, None),
-            height=dp(40),
-            spacing=dp(10)
-        )
-        
-        self.add_bet_btn = Button(
-            text='Add to Parlay',
-            size_hint=(1, 1),
-            background_color=get_color_from_hex('#4CAF50') if self.is_value_bet else get_color_from_hex('#9E9E9E')
-        )
-        
-        bottom_row.add_widget(self.add_bet_btn)
-        
-        # Add all rows to the layout
-        self.add_widget(top_row)
-        self.add_widget(stats_row)
-        self.add_widget(bottom_row)
-        
-        # Bind properties
-        self.bind(team_name=self.update_team_label)
-        self.bind(odds=self.update_odds_label)
-        self.bind(expected_value=self.update_ev_label)
-        self.bind(confidence=self.update_confidence_label)
-        self.bind(recommended_stake=self.update_stake_label)
-        self.bind(is_value_bet=self.update_button_color)
-    
-    def update_team_label(self, instance, value):
-        self.team_label.text = value
+    def refresh_view_attrs(self, rv, index, data):
+        """Remember which data row this view is showing."""
+        self.index = index
+        return super(ValueBetItem, self).refresh_view_attrs(rv, index, data)
     
-    def update_odds_label(self, instance, value):
-        self.odds_label.text = value
-    
-    def update_ev_label(self, instance, value):
-        self.ev_label.text = f"{value:.2f}%"
-        self.ev_label.color = (0, 1, 0, 1) if value > 0 else (1, 0, 0, 1)
-    
-    def update_confidence_label(self, instance, value):
-        self.confidence_label.text = f"{value:.2f}"
-    
-    def update_stake_label(self, instance, value):
-        self.stake_label.text = f"${value:.2f}"
-    
-    def update_button_color(self, instance, value):
-        self.add_bet_btn.background_color = get_color_from_hex('#4CAF50') if value else get_color_from_hex('#9E9E9E')
+    def on_add_pressed(self, instance):
+        """Toggle this bet's parlay selection on the owning screen."""
+        if self.screen is not None and self.index is not None:
+            self.screen.toggle_bet_selection(self.index)
 
 
 class ValueBettingScreen(Screen):
@@ -191,6 +129,14 @@ class ValueBettingScreen(Screen):
         self.strategy = ValueBettingStrategy(analyzer=self.analyzer)
         self.api_service = APIService()
         
+        # One database connection for the screen, opened on first use. It is
+        # shared with the loading thread, so access goes through _db_lock.
+        self.db = BettingDatabase()
+        self._db_lock = threading.Lock()
+        
+        # Bumped on every load, results from older loads are dropped
+        self._load_generation = 0
+        
         # Create main layout
         main_layout = BoxLayout(orientation='vertical')
         
@@ -204,15 +150,12 @@ class ValueBettingScreen(Screen):
         
         # Set background color using canvas
         with top_bar.canvas.before:
-            Color(*get_color_from_hex('#2196F3'))
+            Color(*_BLUE_COLOR)
             self.top_bar_rect = Rectangle(pos=top_bar.pos, size=top_bar.size)
         
         # Update rectangle position and size when the layout changes
-        def update_rect(instance, value):
-            self.top_bar_rect.pos = instance.pos
-            self.top_bar_rect.size = instance.size
-        
-        top_bar.bind(pos=update_rect, size=update_rect)
+        top_bar.fbind('pos', self._sync_top_bar_rect)
+        top_bar.fbind('size', self._sync_top_bar_rect)
         
         title_label = Label(
             text='Value Betting',
@@ -224,7 +167,7 @@ class ValueBettingScreen(Screen):
             text='↻',
             size_hint=(0.2, None),
             height=dp(40),
-            background_color=get_color_from_hex('#4CAF50')
+            background_color=_GREEN_COLOR
         )
         refresh_btn.bind(on_press=self.refresh_value_bets)
         
@@ -315,6 +258,7 @@ class ValueBettingScreen(Screen):
             size_hint=(1, None),
             height=dp(40)
         )
+        self._confidence_percent = 60
         self.confidence_slider.bind(value=self.update_confidence_label)
         
         confidence_row.add_widget(conf_label_row)
@@ -325,16 +269,33 @@ class ValueBettingScreen(Screen):
         settings_layout.add_widget(strategy_row)
         settings_layout.add_widget(confidence_row)
         
-        # Create scrollable content for value bets
-        scroll_view = ScrollView(size_hint=(1, 1))
-        self.value_bets_layout = GridLayout(
-            cols=1,
+        # Recycled list of value bets, only the visible rows get widgets.
+        # Status messages float over the list so showing or hiding them
+        # only changes opacity and never triggers a layout pass.
+        bets_area = FloatLayout(size_hint=(1, 1))
+        
+        self.status_label = Label(
+            text='',
+            size_hint=(1, None),
+            height=dp(80),
+            pos_hint={'x': 0, 'top': 1},
+            opacity=0
+        )
+        
+        self.value_bets_rv = RecycleView(size_hint=(1, 1), viewclass='ValueBetItem')
+        self.value_bets_layout = RecycleBoxLayout(
+            orientation='vertical',
             spacing=dp(10),
             padding=dp(10),
+            default_size=(None, dp(130)),
+            default_size_hint=(1, None),
             size_hint_y=None
         )
         self.value_bets_layout.bind(minimum_height=self.value_bets_layout.setter('height'))
-        scroll_view.add_widget(self.value_bets_layout)
+        self.value_bets_rv.add_widget(self.value_bets_layout)
+        
+        bets_area.add_widget(self.value_bets_rv)
+        bets_area.add_widget(self.status_label)
         
         # Bottom buttons
         bottom_buttons = BoxLayout(
@@ -348,14 +309,14 @@ class ValueBettingScreen(Screen):
         self.parlay_btn = Button(
             text='Create Value Parlay',
             size_hint=(0.5, 1),
-            background_color=get_color_from_hex('#FF9800')
+            background_color=_ORANGE_COLOR
         )
         self.parlay_btn.bind(on_press=self.create_value_parlay)
         
         back_btn = Button(
             text='Back',
             size_hint=(0.5, 1),
-            background_color=get_color_from_hex('#9E9E9E')
+            background_color=_GREY_COLOR
         )
         back_btn.bind(on_press=self.go_back)
         
@@ -365,14 +326,22 @@ class ValueBettingScreen(Screen):
         # Add all sections to the main layout
         main_layout.add_widget(top_bar)
         main_layout.add_widget(settings_layout)
-        main_layout.add_widget(scroll_view)
+        main_layout.add_widget(bets_area)
         main_layout.add_widget(bottom_buttons)
         
         self.add_widget(main_layout)
         
-        # Placeholder for selected value bets
-        self.selected_value_bets = []
+        # Selected value bets, keyed by their row in the value bets list
+        self.selected_value_bets = {}
         
+        # Message popup, built on first use
+        self._message_popup = None
+        
+    def _sync_top_bar_rect(self, instance, value):
+        """Keep the top bar background rectangle on the top bar."""
+        self.top_bar_rect.pos = instance.pos
+        self.top_bar_rect.size = instance.size
+    
     def on_enter(self):
         """Called when the screen is entered."""
         self.load_settings()
@@ -402,7 +371,13 @@ class ValueBettingScreen(Screen):
     
     def update_confidence_label(self, instance, value):
         """Update confidence threshold label when slider changes."""
-        self.confidence_value_label.text = f'{int(value)}%'
+        # The slider reports every touch move, only redraw on a new whole percent
+        percent = int(value)
+        if percent == self._confidence_percent:
+            return
+        
+        self._confidence_percent = percent
+        self.confidence_value_label.text = f'{percent}%'
     
     def save_settings(self):
         """Save user settings."""
@@ -456,152 +431,206 @@ class ValueBettingScreen(Screen):
         self.save_settings()
         
         # Clear existing content
-        self.value_bets_layout.clear_widgets()
-        self.selected_value_bets = []
+        self.value_bets_rv.data = []
+        self.selected_value_bets = {}
         
         # Show loading indicator
-        loading_label = Label(
-            text='Loading value bets...',
-            size_hint_y=None,
-            height=dp(80)
-        )
-        self.value_bets_layout.add_widget(loading_label)
+        self.show_status('Loading value bets...')
         
         # Schedule actual loading
         Clock.schedule_once(lambda dt: self._perform_value_bet_loading(), 0.5)
     
     def _perform_value_bet_loading(self):
-        """Perform the actual loading of value bets."""
+        """Start loading value bets on a background thread."""
+        # Get bankroll, widgets are only read on the main thread
+        try:
+            bankroll = float(self.bankroll_input.text)
+        except ValueError:
+            bankroll = 1000.0
+        
+        # The loading thread works on copies, so save_settings can't change
+        # the analysis parameters halfway through a run
+        strategy = copy.copy(self.strategy)
+        strategy.analyzer = copy.copy(self.analyzer)
+        
+        self._load_generation += 1
+        
+        # Query and analysis run off the UI thread so rendering isn't blocked
+        loading_thread = threading.Thread(
+            target=self._load_value_bets,
+            args=(bankroll, strategy, self._load_generation)
+        )
+        loading_thread.daemon = True
+        loading_thread.start()
+    
+    def _load_value_bets(self, bankroll, strategy, generation):
+        """
+        Fetch active bets and build the betting plan.
+        
+        Runs on a background thread, results are handed back to the
+        main thread through the Clock.
+        
+        Args:
+            bankroll (float): Current bankroll amount
+            strategy (ValueBettingStrategy): Snapshot of the screen's strategy
+            generation (int): Load counter value when this load started
+        """
         try:
-            # Clear the layout again
-            self.value_bets_layout.clear_widgets()
-            
-            # Get bankroll
-            try:
-                bankroll = float(self.bankroll_input.text)
-            except ValueError:
-                bankroll = 1000.0
-            
             # Get active bets from database
-            db = BettingDatabase()
-            bets_data = db.get_active_bets()
+            bets_data = self._query_db(BettingDatabase.get_active_bets)
             
             if not bets_data:
                 # No bets available, show message
-                no_bets_label = Label(
-                    text='No active bets found. Create some bets first.',
-                    size_hint_y=None,
-                    height=dp(80)
-                )
-                self.value_bets_layout.add_widget(no_bets_label)
+                self._schedule_status('No active bets found. Create some bets first.', generation)
                 return
             
             # Convert to format needed for value betting analysis
-            available_bets = []
-            for bet in bets_data:
-                # Generate a simulated true probability for demonstration
-                # In a real app, this would come from a model or user input
-                team_name = bet.get('team_name', 'Unknown Team')
-                odds = bet.get('odds', '+100')
-                
-                # Extract numerical part from odds
-                import re
-                odds_value = re.search(r'[+-]?\d+', odds)
-                if odds_value:
-                    odds_value = int(odds_value.group())
-                    
-                    # Generate a true probability that's slightly better than implied
-                    from database import american_to_decimal
-                    implied_prob = 1 / american_to_decimal(odds)
-                    
-                    # For demonstration, we'll make favorable odds seem more valuable
-                    if odds_value > 0:  # Underdog
-                        true_prob = implied_prob * (1 + 0.15)  # 15% edge on underdogs
-                    else:  # Favorite
-                        true_prob = implied_prob * (1 + 0.05)  # 5% edge on favorites
-                    
-                    # Cap at reasonable values
-                    true_prob = min(0.95, max(0.05, true_prob))
-                else:
-                    true_prob = 0.5  # Default
-                
-                available_bets.append({
-                    'team_name': team_name,
-                    'odds': odds,
-                    'true_probability': true_prob,
-                    'sport': bet.get('sport_name', 'Unknown'),
-                    'bet_id': bet.get('id'),
-                    'event_date': bet.get('event_date')
-                })
+            available_bets = [{
+                'team_name': bet.get('team_name', 'Unknown Team'),
+                'odds': bet.get('odds', '+100'),
+                'true_probability': _simulated_true_probability(bet.get('odds', '+100')),
+                'sport': bet.get('sport_name', 'Unknown'),
+                'bet_id': bet.get('id'),
+                'event_date': bet.get('event_date')
+            } for bet in bets_data]
             
             # Generate betting plan
-            betting_plan = self.strategy.generate_betting_plan(bankroll, available_bets)
-            
-            # Display value bets
-            value_bets = betting_plan.get('value_bets', [])
+            betting_plan = strategy.generate_betting_plan(bankroll, available_bets)
             
+        except Exception as e:
+            # Show error message
+            self._schedule_status(f'Error loading value bets: {e}', generation)
+            return
+        
+        value_bets = betting_plan.get('value_bets', [])
+        Clock.schedule_once(lambda dt: self._display_value_bets(value_bets, generation), 0)
+    
+    def _display_value_bets(self, value_bets, generation):
+        """
+        Display value bets in the list.
+        
+        Args:
+            value_bets (list): Value bets from the betting plan
+            generation (int): Load counter value of the load that produced them
+        """
+        # A newer load has started since, its results will replace these
+        if generation != self._load_generation:
+            return
+        
+        try:
             if not value_bets:
-                no_value_label = Label(
-                    text='No value bets found with current settings.',
-                    size_hint_y=None,
-                    height=dp(80)
-                )
-                self.value_bets_layout.add_widget(no_value_label)
+                self.show_status('No value bets found with current settings.')
                 return
             
-            # Add value bets to the layout with animations
-            for i, bet in enumerate(value_bets):
-                bet_item = ValueBetItem(
-                    team_name=bet.get('team_name', 'Unknown'),
-                    odds=bet.get('odds', '+100'),
-                    expected_value=bet.get('ev', 0),
-                    is_value_bet=bet.get('is_value_bet', False),
-                    confidence=bet.get('confidence', 0),
-                    recommended_stake=bet.get('recommended_stake', 0)
-                )
-                
-                # Store the bet data for later use
-                bet_item.bet_data = bet
-                
-                # Bind the add bet button
-                bet_item.add_bet_btn.bind(on_press=lambda btn, item=bet_item: self.toggle_bet_selection(item))
-                
-                self.value_bets_layout.add_widget(bet_item)
-                
-                # Apply animation with increasing delay
-                bet_item.opacity = 0
-                Clock.schedule_once(
-                    lambda dt, widget=bet_item: fade_in(widget, duration=0.3),
-                    i * 0.1  # Staggered delay
-                )
+            self.hide_status()
+            
+            # Hand the rows to the RecycleView, it only builds widgets for visible ones
+            self.value_bets_rv.data = [{
+                'team_name': bet.get('team_name', 'Unknown'),
+                'odds': bet.get('odds', '+100'),
+                'expected_value': bet.get('ev', 0),
+                'is_value_bet': bet.get('is_value_bet', False),
+                'confidence': bet.get('confidence', 0),
+                'recommended_stake': bet.get('recommended_stake', 0),
+                'selected': False,
+                'bet_data': bet,
+                'screen': self
+            } for bet in value_bets]
+            
+            # Fade in the rows that are on screen once the view has laid them out
+            Clock.schedule_once(lambda dt: self._animate_visible_items(), 0)
             
             # Update parlay button based on available value bets
             self.parlay_btn.disabled = len(value_bets) < 2
             
         except Exception as e:
             # Show error message
-            error_label = Label(
-                text=f'Error loading value bets: {e}',
-                size_hint_y=None,
-                height=dp(80)
-            )
-            self.value_bets_layout.add_widget(error_label)
+            self.show_status(f'Error loading value bets: {e}')
+    
+    def _query_db(self, query, *args):
+        """
+        Run a BettingDatabase query on the screen's shared connection.
+        
+        Args:
+            query (callable): BettingDatabase method to call, e.g. BettingDatabase.get_active_bets
+            *args: Arguments for the query
+            
+        Returns:
+            The query's result
+        """
+        with self._db_lock:
+            if self.db.conn is None:
+                self.db.connect(check_same_thread=False)
+            return query(self.db, *args)
+    
+    def _schedule_status(self, text, generation):
+        """Show a status message from a background load, unless a newer load started."""
+        def show(dt):
+            if generation == self._load_generation:
+                self.show_status(text)
+        
+        Clock.schedule_once(show, 0)
+    
+    def show_status(self, text):
+        """Show a status message over the value bets list."""
+        self.status_label.text = text
+        self.status_label.opacity = 1
+    
+    def hide_status(self):
+        """Hide the status message."""
+        self.status_label.opacity = 0
     
-    def toggle_bet_selection(self, bet_item):
+    def _animate_visible_items(self):
+        """Fade in the value bet rows that are inside the list's viewport."""
+        # The RecycleView keeps a few views just outside the viewport, those
+        # are shown directly instead of running an animation nobody sees
+        _, view_y, _, view_height = self.value_bets_rv.get_viewport()
+        view_top = view_y + view_height
+        
+        items = []
+        for bet_item in self.value_bets_layout.children:
+            if bet_item.top > view_y and bet_item.y < view_top:
+                items.append(bet_item)
+            else:
+                bet_item.opacity = 1
+        items.sort(key=lambda item: item.index or 0)
+        
+        # Staggering long lists just delays the last rows
+        stagger = 0.1 if len(items) <= _MAX_STAGGERED_ITEMS else 0
+        
+        for i, bet_item in enumerate(items):
+            # Apply animation with increasing delay, the delay is part of the
+            # animation so no extra Clock event is scheduled per item
+            fade_in(bet_item, duration=0.3, delay=i * stagger)
+    
+    def _get_view(self, index):
+        """Get the widget currently displaying a data row, if any."""
+        for bet_item in self.value_bets_layout.children:
+            if bet_item.index == index:
+                return bet_item
+        return None
+    
+    def toggle_bet_selection(self, index):
         """Toggle selection of a value bet for parlay creation."""
-        if bet_item in self.selected_value_bets:
+        row = self.value_bets_rv.data[index]
+        
+        if index in self.selected_value_bets:
             # Deselect
-            self.selected_value_bets.remove(bet_item)
-            bet_item.add_bet_btn.text = 'Add to Parlay'
-            bet_item.add_bet_btn.background_color = get_color_from_hex('#4CAF50')
+            row['selected'] = False
+            del self.selected_value_bets[index]
         else:
             # Select
-            self.selected_value_bets.append(bet_item)
-            bet_item.add_bet_btn.text = 'Selected ✓'
-            bet_item.add_bet_btn.background_color = get_color_from_hex('#FF9800')
-            
+            row['selected'] = True
+            self.selected_value_bets[index] = row['bet_data']
+        
+        # Recycled widgets are refreshed from the data rows
+        self.value_bets_rv.refresh_from_data()
+        
+        if row['selected']:
             # Apply pulse animation
-            pulse(bet_item)
+            bet_item = self._get_view(index)
+            if bet_item is not None:
+                pulse(bet_item)
     
     def refresh_value_bets(self, instance=None):
         """Refresh value bets display."""
@@ -611,27 +640,17 @@ class ValueBettingScreen(Screen):
         """Create a value parlay from selected bets."""
         if len(self.selected_value_bets) < 2:
             # Show error popup
-            popup = Popup(
-                title='Not Enough Bets',
-                content=Label(text='Please select at least 2 bets for a parlay.'),
-                size_hint=(0.8, 0.4)
-            )
-            popup.open()
+            self.show_message_popup('Not Enough Bets', 'Please select at least 2 bets for a parlay.')
             return
         
         # Get bet data from selected bets
-        selected_bet_data = [item.bet_data for item in self.selected_value_bets]
+        selected_bet_data = list(self.selected_value_bets.values())
         
         # Calculate combined probability and expected value
-        combined_prob = 1.0
-        for bet in selected_bet_data:
-            combined_prob *= bet.get('true_probability', 0.5)
+        combined_prob = math.prod(bet.get('true_probability', 0.5) for bet in selected_bet_data)
         
         # Calculate decimal odds
-        from database import american_to_decimal, decimal_to_american
-        decimal_odds = 1.0
-        for bet in selected_bet_data:
-            decimal_odds *= american_to_decimal(bet.get('odds', '+100'))
+        decimal_odds = math.prod(american_to_decimal(bet.get('odds', '+100')) for bet in selected_bet_data)
         
         # Calculate EV
         ev = (decimal_odds * combined_prob) - 1
@@ -735,7 +754,7 @@ class ValueBettingScreen(Screen):
             text_size=(None, dp(30))
         ))
         
-        ev_color = get_color_from_hex('#4CAF50') if ev_percentage > 0 else get_color_from_hex('#F44336')
+        ev_color = _GREEN_COLOR if ev_percentage > 0 else _RED_COLOR
         stats_grid.add_widget(Label(
             text=f"{ev_percentage:.2f}%",
             halign='right',
@@ -752,7 +771,7 @@ class ValueBettingScreen(Screen):
             text=verdict_text,
             size_hint=(1, None),
             height=dp(40),
-            color=get_color_from_hex('#4CAF50') if ev_percentage > 0 else get_color_from_hex('#F44336')
+            color=_GREEN_COLOR if ev_percentage > 0 else _RED_COLOR
         )
         content.add_widget(verdict_label)
         
@@ -767,13 +786,13 @@ class ValueBettingScreen(Screen):
         cancel_btn = Button(
             text='Cancel',
             size_hint=(0.5, 1),
-            background_color=get_color_from_hex('#9E9E9E')
+            background_color=_GREY_COLOR
         )
         
         create_btn = Button(
             text='Create Parlay',
             size_hint=(0.5, 1),
-            background_color=get_color_from_hex('#4CAF50') if ev_percentage > 0 else get_color_from_hex('#F44336')
+            background_color=_GREEN_COLOR if ev_percentage > 0 else _RED_COLOR
         )
         
         # Create popup
@@ -805,12 +824,9 @@ class ValueBettingScreen(Screen):
                 self.show_error_popup('Error', 'Could not create parlay: invalid bet IDs')
                 return
             
-            # Get bets from database
-            bets = []
-            for bet_id in bet_ids:
-                bet = Bet.get_by_id(bet_id)
-                if bet:
-                    bets.append(bet)
+            # Get bets from database in a single query
+            rows = self._query_db(BettingDatabase.get_bets_by_ids, bet_ids)
+            bets = [Bet.from_dict(row) for row in rows]
             
             if len(bets) < 2:
                 # Show error
@@ -824,32 +840,28 @@ class ValueBettingScreen(Screen):
             except:
                 stake = 10.0  # Default stake
             
-            # Create parlay
-            parlay = Parlay(bets=bets, stake=stake)
-            
             # Calculate odds and payout
-            parlay.calculate_odds()
-            parlay.calculate_payout()
+            total_odds = calculate_parlay_odds([bet.odds for bet in bets])
+            potential_payout = calculate_payout(total_odds, stake)
             
-            # Set notes indicating this is a value parlay
-            parlay.notes = "Value Parlay"
+            # Save to database, notes mark this as a value parlay
+            parlay_id = self._query_db(
+                BettingDatabase.create_parlay,
+                [bet.id for bet in bets], stake, total_odds, potential_payout, "Value Parlay"
+            )
             
-            # Save to database
-            parlay.save()
+            if parlay_id is None:
+                self.show_error_popup('Error', 'Could not save the parlay')
+                return
             
             # Close popup
             popup.dismiss()
             
             # Show success popup
-            success_popup = Popup(
-                title='Success',
-                content=Label(text='Value parlay created successfully!'),
-                size_hint=(0.8, 0.4)
-            )
-            success_popup.open()
+            self.show_message_popup('Success', 'Value parlay created successfully!')
             
             # Clear selections
-            self.selected_value_bets = []
+            self.selected_value_bets = {}
             self.refresh_value_bets()
             
         except Exception as e:
@@ -861,11 +873,27 @@ class ValueBettingScreen(Screen):
         self.save_settings()
         self.manager.current = 'main'
     
+    def show_message_popup(self, title, message):
+        """
+        Show a simple message popup.
+        
+        The popup is built on first use and reused afterwards, only its
+        title and text change between messages.
+        
+        Args:
+            title (str): Popup title
+            message (str): Message text
+        """
+        if self._message_popup is None:
+            self._message_popup = Popup(
+                content=Label(),
+                size_hint=(0.8, 0.4)
+            )
+        
+        self._message_popup.title = title
+        self._message_popup.content.text = message
+        self._message_popup.open()
+    
     def show_error_popup(self, title, message):
         """Show an error popup."""
-        popup = Popup(
-            title=title,
-            content=Label(text=message),
-            size_hint=(0.8, 0.4)
-        )
-        popup.open()
\ No newline at end of file
+        self.show_message_popup(title, message)
\ No newline at end of file